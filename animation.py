@@ -0,0 +1,75 @@
+class Animation:
+    """A timed effect advanced by the scheduler instead of blocking the loop.
+
+    ``on_update(progress)`` is called every frame with the progress in
+    ``[0, 1]`` and ``on_finish()`` once when the duration has elapsed.
+    """
+
+    def __init__(self, duration, on_update=None, on_finish=None, on_start=None):
+        self.duration = duration
+        self.elapsed = 0.0
+        self.on_start = on_start
+        self.on_update = on_update
+        self.on_finish = on_finish
+        self.started = False
+        self.finished = False
+
+    def update(self, dt):
+        """Advance by ``dt`` seconds and return the time left over after finishing."""
+        if not self.started:
+            self.started = True
+            if self.on_start:
+                self.on_start()
+        self.elapsed += dt
+        overflow = self.elapsed - self.duration
+        if self.on_update:
+            self.on_update(min(self.elapsed / self.duration, 1.0) if self.duration else 1.0)
+        if overflow >= 0:
+            self.finished = True
+            if self.on_finish:
+                self.on_finish()
+            return overflow
+        return 0.0
+
+
+class Sequence:
+    """Runs animations one after another."""
+
+    def __init__(self, animations):
+        self.animations = list(animations)
+        self.finished = not self.animations
+
+    def update(self, dt):
+        while self.animations:
+            dt = self.animations[0].update(dt)
+            if not self.animations[0].finished:
+                return 0.0
+            self.animations.pop(0)
+            if dt <= 0:
+                break
+        self.finished = not self.animations
+        return dt
+
+
+class Scheduler:
+    """Advances running animations by the frame's delta time."""
+
+    def __init__(self):
+        self.animations = []
+
+    @property
+    def busy(self):
+        return bool(self.animations)
+
+    def add(self, animation):
+        self.animations.append(animation)
+        return animation
+
+    def update(self, dt):
+        for animation in list(self.animations):
+            animation.update(dt)
+            if animation.finished:
+                self.animations.remove(animation)
+
+    def clear(self):
+        self.animations.clear()
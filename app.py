@@ -0,0 +1,69 @@
+import os
+import sys
+import time
+
+# Taken before pygame is imported so the report includes its import time
+_START = time.perf_counter()
+
+import pygame
+from settings import WIDTH, HEIGHT
+
+_PYGAME_IMPORTED = time.perf_counter()
+
+CAPTION = "LCS Algorithm Game"
+
+# Set LCS_STARTUP_REPORT=1 to print how long each startup phase took
+STARTUP_REPORT = os.environ.get("LCS_STARTUP_REPORT") == "1"
+
+
+class App:
+    """Owns the game window and the startup timeline.
+
+    Only the display and font subsystems are initialized here; the mixer is
+    started by the audio manager on first use, so opening the window never
+    waits for the audio device.
+    """
+
+    def __init__(self):
+        self.screen = None
+        self.marks = [("start", _START), ("import pygame", _PYGAME_IMPORTED)]
+
+    def get_screen(self):
+        """Create the window on first use and return it."""
+        if self.screen is None:
+            pygame.display.init()
+            pygame.font.init()
+            self.mark("pygame init")
+            self.screen = pygame.display.set_mode((WIDTH, HEIGHT))
+            pygame.display.set_caption(CAPTION)
+            self.mark("window")
+        return self.screen
+
+    def mark(self, name):
+        """Record that a startup phase finished now."""
+        self.marks.append((name, time.perf_counter()))
+
+    def report(self, file=sys.stdout):
+        """Print the time of every startup phase since the process started."""
+        print("Startup timing:", file=file)
+        previous = _START
+        for name, moment in self.marks[1:]:
+            print(f"  {name:<20}{(moment - previous) * 1000:8.1f} ms{(moment - _START) * 1000:10.1f} ms total",
+                  file=file)
+            previous = moment
+
+
+_app = None
+
+
+def get_app():
+    """Return the shared application context."""
+    global _app
+    if _app is None:
+        _app = App()
+    return _app
+
+
+def get_screen():
+    """Return the game window, creating it once."""
+    return get_app().get_screen()
@@ -0,0 +1,54 @@
+import os
+
+import pygame
+from app import get_screen
+from settings import WIDTH, HEIGHT
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))  # Get the absolute path of the script's directory
+
+BG_IMAGE_PATH = os.path.join(BASE_DIR, "assets", "sun.png")
+
+LOGO_PATH = os.path.join(BASE_DIR, "assets", "logo.png")
+
+
+class AssetCache:
+    """Images decoded once and kept converted to the display format per target size.
+
+    Every screen shares the same surfaces, so callers must ``copy()`` an image
+    before drawing on it. Fonts are shared through ``text_cache`` and sound
+    effects through ``audio``.
+    """
+
+    def __init__(self):
+        self.sources = {}
+        self.images = {}
+
+    def image(self, path, size=None, alpha=False):
+        key = (path, size, alpha)
+        surface = self.images.get(key)
+        if surface is None:
+            source = self.sources.get(path)
+            if source is None:
+                source = self.sources[path] = pygame.image.load(path)
+            surface = pygame.transform.scale(source, size) if size and source.get_size() != size else source
+            get_screen()  # converting needs the display format
+            surface = surface.convert_alpha() if alpha else surface.convert()
+            self.images[key] = surface
+        return surface
+
+    def clear(self):
+        self.sources.clear()
+        self.images.clear()
+
+
+_assets = AssetCache()
+
+
+def load_image(path, size=None, alpha=False):
+    """Return the shared, display-converted image at ``path`` scaled to ``size``."""
+    return _assets.image(path, size, alpha)
+
+
+def get_background():
+    """Return the shared full-screen background image."""
+    return load_image(BG_IMAGE_PATH, (WIDTH, HEIGHT))
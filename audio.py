@@ -0,0 +1,94 @@
+import os
+import sys
+import threading
+import time
+
+import pygame
+from profiler import profiler
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))  # Get the absolute path of the script's directory
+
+SOUND_PATHS = {
+    "correct": os.path.join(BASE_DIR, "assets", "correct.mp3"),
+    "wrong": os.path.join(BASE_DIR, "assets", "wrong.mp3"),
+    "win": os.path.join(BASE_DIR, "assets", "win.wav"),
+}
+
+# Mixer channels kept for sound effects so other playback never steals them
+RESERVED_CHANNELS = 4
+
+
+class AudioManager:
+    """Decodes the sound effects once and plays them on a pool of reserved channels.
+
+    Sounds are decoded in a background thread; a sound requested before it is
+    ready is skipped instead of stalling the frame. Without an audio device
+    every call is a no-op.
+    """
+
+    def __init__(self, paths=SOUND_PATHS, channels=RESERVED_CHANNELS):
+        self.paths = paths
+        self.channel_count = channels
+        self.sounds = {}
+        self.channels = []
+        self.started = []
+        self.available = False
+        self.loaded = threading.Event()
+
+    def start(self, background=True):
+        """Initialize the mixer, reserve the channel pool and start decoding."""
+        try:
+            if not pygame.mixer.get_init():
+                pygame.mixer.init()
+            pygame.mixer.set_num_channels(max(pygame.mixer.get_num_channels(), self.channel_count))
+            pygame.mixer.set_reserved(self.channel_count)
+            self.channels = [pygame.mixer.Channel(i) for i in range(self.channel_count)]
+            self.started = [0.0] * self.channel_count
+        except pygame.error as e:
+            print("Audio disabled:", e)
+            self.loaded.set()
+            return
+        self.available = True
+
+        if background and sys.platform != "emscripten":  # no threads in the browser build
+            threading.Thread(target=self.load_sounds, name="audio-preload", daemon=True).start()
+        else:
+            self.load_sounds()
+
+    def load_sounds(self):
+        for name, path in self.paths.items():
+            try:
+                self.sounds[name] = pygame.mixer.Sound(path)
+            except (pygame.error, OSError) as e:
+                print("Error loading sound:", e)
+        self.loaded.set()
+
+    def _free_channel(self):
+        """Index of an idle channel, or of the one whose sound started longest ago."""
+        for index, channel in enumerate(self.channels):
+            if not channel.get_busy():
+                return index
+        return min(range(len(self.channels)), key=self.started.__getitem__)
+
+    def play(self, name):
+        """Play a preloaded sound effect; does nothing without audio or before it is decoded."""
+        if not self.available:
+            return
+        sound = self.sounds.get(name)
+        if sound is not None:
+            with profiler.section("audio"):
+                index = self._free_channel()
+                self.channels[index].play(sound)
+                self.started[index] = time.perf_counter()
+
+
+_audio = None
+
+
+def get_audio():
+    """Return the shared audio manager, starting it on first use."""
+    global _audio
+    if _audio is None:
+        _audio = AudioManager()
+        _audio.start()
+    return _audio
@@ -0,0 +1,181 @@
+import argparse
+import json
+import os
+import random
+import statistics
+import tempfile
+import time
+import tracemalloc
+
+from headless import enable_headless, VirtualClock, AutoPlayer
+
+enable_headless()
+# Never touch the real high scores, player models or leaderboard from a benchmark run
+_BENCH_DIR = tempfile.mkdtemp(prefix="lcs-bench-")
+os.environ.setdefault("LCS_SCORE_FILE", os.path.join(_BENCH_DIR, "score.json"))
+os.environ.setdefault("LCS_PLAYER_FILE", os.path.join(_BENCH_DIR, "players.json"))
+os.environ.setdefault("LCS_LEADERBOARD_DB", os.path.join(_BENCH_DIR, "leaderboard.db"))
+
+import lcs  # must be imported after the SDL drivers are set
+from replay import SessionReplayer
+
+# LCSGame methods whose time is reported separately
+TIMED_METHODS = ["step", "draw_screen", "handle_input", "find_lcs", "get_new_word_pair"]
+
+
+class MethodTimer:
+    """Wraps methods of an object and accumulates their call counts and durations."""
+
+    def __init__(self):
+        self.totals = {}
+        self.calls = {}
+        self.wrapped = []
+
+    def wrap(self, obj, name, label=None):
+        method = getattr(obj, name)
+        self.wrapped.append((obj, name, method))
+        label = label or name
+        self.totals.setdefault(label, 0.0)
+        self.calls.setdefault(label, 0)
+
+        def timed(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return method(*args, **kwargs)
+            finally:
+                self.totals[label] += time.perf_counter() - start
+                self.calls[label] += 1
+
+        setattr(obj, name, timed)
+
+    def restore(self):
+        """Put the original methods back; shared objects such as the difficulty engine outlive a session."""
+        for obj, name, method in reversed(self.wrapped):
+            setattr(obj, name, method)
+        self.wrapped.clear()
+
+
+def percentile(values, fraction):
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+def run_session(seed, frames, trace_allocations, replay_path=None):
+    """Play one headless session (scripted, or a recorded one) and return its raw measurements."""
+    random.seed(seed)
+    if replay_path:
+        clock = SessionReplayer(replay_path, speed=0)
+        game = lcs.LCSGame(recorder=clock)
+    else:
+        clock = VirtualClock()
+        player = AutoPlayer(seed)
+        game = lcs.LCSGame(event_source=player, time_source=clock.time)
+        player.game = game
+
+    timer = MethodTimer()
+    for name in TIMED_METHODS:
+        timer.wrap(game, name)
+    timer.wrap(game.renderer, "present", "present")
+    # Picking the next pair: a pool lookup, or scoring a few random pairs without a pool
+    timer.wrap(game.difficulty, "choose", "difficulty.choose")
+
+    frame_times = []
+    allocations = []
+    if trace_allocations:
+        tracemalloc.start()
+    while game.running and len(frame_times) < frames:
+        dt = clock.tick(60) / 1000
+        if trace_allocations:
+            before = tracemalloc.get_traced_memory()[0]
+            tracemalloc.reset_peak()
+        start = time.perf_counter()
+        game.step(dt)
+        frame_times.append(time.perf_counter() - start)
+        if trace_allocations:
+            allocations.append(tracemalloc.get_traced_memory()[1] - before)
+    if trace_allocations:
+        tracemalloc.stop()
+    timer.restore()
+
+    return {
+        "seed": seed,
+        "frames": len(frame_times),
+        "score": game.score,
+        "level": game.level,
+        "frame_times": frame_times,
+        "allocations": allocations,
+        "totals": timer.totals,
+        "calls": timer.calls,
+    }
+
+
+def summarize(sessions):
+    frame_times = [t for session in sessions for t in session["frame_times"]]
+    allocations = [a for session in sessions for a in session["allocations"]]
+    summary = {
+        "sessions": len(sessions),
+        "frames": len(frame_times),
+        "frame_ms": {
+            "mean": statistics.fmean(frame_times) * 1000 if frame_times else 0.0,
+            "p50": percentile(frame_times, 0.50) * 1000,
+            "p90": percentile(frame_times, 0.90) * 1000,
+            "p99": percentile(frame_times, 0.99) * 1000,
+            "max": max(frame_times, default=0.0) * 1000,
+        },
+        "methods": {},
+    }
+    if allocations:
+        summary["alloc_bytes_per_frame"] = {
+            "mean": statistics.fmean(allocations),
+            "p99": percentile(allocations, 0.99),
+            "max": max(allocations),
+        }
+    for name in sessions[0]["totals"] if sessions else []:
+        total = sum(session["totals"][name] for session in sessions)
+        calls = sum(session["calls"][name] for session in sessions)
+        summary["methods"][name] = {
+            "calls": calls,
+            "total_ms": total * 1000,
+            "per_call_us": total / calls * 1e6 if calls else 0.0,
+        }
+    return summary
+
+
+def print_summary(summary):
+    frame = summary["frame_ms"]
+    print(f"{summary['sessions']} sessions, {summary['frames']} frames")
+    print(f"frame time ms: mean {frame['mean']:.3f}  p50 {frame['p50']:.3f}  p90 {frame['p90']:.3f}  "
+          f"p99 {frame['p99']:.3f}  max {frame['max']:.3f}")
+    if "alloc_bytes_per_frame" in summary:
+        alloc = summary["alloc_bytes_per_frame"]
+        print(f"allocated bytes/frame: mean {alloc['mean']:.0f}  p99 {alloc['p99']:.0f}  max {alloc['max']:.0f}")
+    print(f"{'method':<28}{'calls':>8}{'total ms':>12}{'us/call':>12}")
+    for name, method in summary["methods"].items():
+        print(f"{name:<28}{method['calls']:>8}{method['total_ms']:>12.2f}{method['per_call_us']:>12.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark LCSGame headless with scripted sessions.")
+    parser.add_argument("--sessions", type=int, default=3)
+    parser.add_argument("--frames", type=int, default=3600, help="maximum frames per session (60 per second)")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--allocations", action="store_true", help="trace per-frame allocations (slower, Python 3.9+)")
+    parser.add_argument("--json", help="also write the summary to this file")
+    parser.add_argument("--replay", nargs="+", help="replay these recorded sessions instead of scripted ones")
+    args = parser.parse_args()
+
+    if args.replay:
+        sessions = [run_session(args.seed, args.frames, args.allocations, path) for path in args.replay]
+    else:
+        sessions = [run_session(args.seed + i, args.frames, args.allocations) for i in range(args.sessions)]
+    summary = summarize(sessions)
+    print_summary(summary)
+    if args.json:
+        with open(args.json, "w") as file:
+            json.dump(summary, file, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+import mmap
+import os
+import struct
+
+from words import WordIndex
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))  # Get the absolute path of the script's directory
+
+# Plain word list shipped with a build (one word per line), used instead of nltk when present
+BUNDLED_WORDS_PATH = os.path.join(BASE_DIR, "assets", "words.txt")
+
+# Processed word index written on first use and memory-mapped on later launches
+CACHE_PATH = os.environ.get("LCS_WORDS_CACHE", os.path.join(BASE_DIR, "assets", "words.bin"))
+
+# magic, format version, number of buckets; followed by one byte size per bucket
+CACHE_MAGIC = b"LCSW"
+CACHE_VERSION = 1
+HEADER = struct.Struct("<4sHH")
+
+
+def load_source_words():
+    """Read the raw word list from the bundled file or the local nltk data."""
+    if os.path.exists(BUNDLED_WORDS_PATH):
+        with open(BUNDLED_WORDS_PATH, "r", encoding="utf-8") as file:
+            return [line.strip() for line in file if line.strip()]
+
+    import nltk
+
+    try:
+        return nltk.corpus.words.words()
+    except LookupError:
+        # Last resort on a machine that has never seen the corpus; the result is cached below
+        print("Word corpus not found locally, downloading it once.")
+        nltk.download("words", quiet=True)
+        return nltk.corpus.words.words()
+
+
+def write_cache(index, path=CACHE_PATH):
+    """Atomically serialize a word index to ``path``."""
+    encoded = [bucket.encode("utf-8") for bucket in index.buckets]
+    temp_path = f"{path}.tmp"
+    with open(temp_path, "wb") as file:
+        file.write(HEADER.pack(CACHE_MAGIC, CACHE_VERSION, len(encoded)))
+        file.write(struct.pack(f"<{len(encoded)}I", *(len(data) for data in encoded)))
+        for data in encoded:
+            file.write(data)
+    os.replace(temp_path, path)
+
+
+def read_cache(path=CACHE_PATH):
+    """Load a word index from ``path``, returning None if it is missing, stale or corrupted."""
+    if not os.path.exists(path):
+        return None
+    if os.path.exists(BUNDLED_WORDS_PATH) and os.path.getmtime(BUNDLED_WORDS_PATH) > os.path.getmtime(path):
+        return None
+
+    with open(path, "rb") as file:
+        try:
+            data = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:  # empty file
+            return None
+    with data:
+        if len(data) < HEADER.size:
+            return None
+        magic, version, bucket_count = HEADER.unpack_from(data, 0)
+        if magic != CACHE_MAGIC or version != CACHE_VERSION:
+            return None
+        # A truncated or damaged cache is rebuilt like a stale one
+        try:
+            sizes = struct.unpack_from(f"<{bucket_count}I", data, HEADER.size)
+            offset = HEADER.size + 4 * bucket_count
+            if offset + sum(sizes) > len(data):
+                return None
+            buckets = []
+            for length, size in enumerate(sizes):
+                bucket = data[offset:offset + size].decode("utf-8")
+                if length and len(bucket) % length:
+                    return None
+                buckets.append(bucket)
+                offset += size
+        except (struct.error, UnicodeDecodeError) as e:
+            print("Error reading word cache, rebuilding it:", e)
+            return None
+    return WordIndex(buckets)
+
+
+def load_word_index():
+    """Load the word index from the cache, building and caching it if needed."""
+    index = read_cache()
+    if index is not None:
+        return index
+
+    index = WordIndex.from_words(load_source_words())
+    try:
+        write_cache(index)
+    except OSError as e:
+        print("Error saving word cache:", e)
+    return index
+
+
+_word_index = None
+
+
+def get_word_index():
+    """Return the process-wide word index, loading it on first use."""
+    global _word_index
+    if _word_index is None:
+        _word_index = load_word_index()
+    return _word_index
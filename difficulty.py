@@ -0,0 +1,143 @@
+import atexit
+import math
+import os
+import random
+
+from puzzles import score_pair
+from scores import ScoreStore
+from settings import PLAYER
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))  # Get the absolute path of the script's directory
+
+PLAYER_FILE = os.environ.get("LCS_PLAYER_FILE", os.path.join(BASE_DIR, "assets", "players.json"))
+
+# Share of puzzles a player should solve; the next pair is picked to match it
+TARGET_SOLVE_RATE = 0.7
+
+# Difficulty points per logit of solve probability, and how fast the skill estimate moves
+DIFFICULTY_SCALE = 1.0
+LEARNING_RATE = 0.6
+
+# Weight of the newest puzzle in the rolling success rate and solve time
+SMOOTHING = 0.2
+
+START_SKILL = 4.0
+START_SECONDS = 10.0
+
+# The game lasts long enough for about this many puzzles at the player's pace
+PUZZLES_PER_GAME = 6
+MIN_TIME_LIMIT = 45
+MAX_TIME_LIMIT = 120
+
+# Without a puzzle pool, this many random pairs are scored and the closest one is used
+FALLBACK_CANDIDATES = 8
+
+# Word lengths of those pairs at a new player's target difficulty; every difficulty point above
+# or below it moves the range by this many letters, within the lengths the corpus offers
+FALLBACK_LENGTHS = (5, 10)
+LETTERS_PER_DIFFICULTY = 2
+MIN_WORD_LENGTH = 3
+MAX_WORD_LENGTH = 20
+
+
+class PlayerModel:
+    """Rolling estimate of one player's skill on the puzzle difficulty scale.
+
+    A puzzle of difficulty ``d`` is expected to be solved with probability
+    ``1 / (1 + exp((d - skill) / DIFFICULTY_SCALE))``. After every puzzle the
+    skill moves by the gap between the outcome and that expectation, so it
+    settles where the player solves about as much as predicted. Success rate
+    and solve time are kept as exponentially weighted moving averages.
+    """
+
+    def __init__(self, skill=START_SKILL, success=TARGET_SOLVE_RATE, seconds=START_SECONDS, puzzles=0):
+        self.skill = skill
+        self.success = success
+        self.seconds = seconds
+        self.puzzles = puzzles
+
+    @classmethod
+    def from_dict(cls, data):
+        """Model from a saved entry; unknown keys are ignored and bad fields keep their defaults."""
+        model = cls()
+        if not isinstance(data, dict):
+            return model
+        for field, kind in (("skill", float), ("success", float), ("seconds", float), ("puzzles", int)):
+            try:
+                setattr(model, field, kind(data.get(field, getattr(model, field))))
+            except (TypeError, ValueError):
+                pass
+        return model
+
+    def to_dict(self):
+        return {"skill": self.skill, "success": self.success, "seconds": self.seconds, "puzzles": self.puzzles}
+
+    def expected_success(self, difficulty):
+        return 1 / (1 + math.exp((difficulty - self.skill) / DIFFICULTY_SCALE))
+
+    def target_difficulty(self, solve_rate=TARGET_SOLVE_RATE):
+        """Difficulty the player is expected to solve with probability ``solve_rate``."""
+        return self.skill - DIFFICULTY_SCALE * math.log(solve_rate / (1 - solve_rate))
+
+    def record(self, difficulty, solved, seconds, mistakes=0):
+        """Update the model with one finished puzzle; wrong attempts count as partial failure."""
+        outcome = 1 / (1 + mistakes) if solved else 0.0
+        self.skill += LEARNING_RATE * (outcome - self.expected_success(difficulty))
+        self.success += SMOOTHING * (outcome - self.success)
+        if solved:
+            self.seconds += SMOOTHING * (seconds - self.seconds)
+        self.puzzles += 1
+
+    def time_limit(self):
+        """Game length in seconds that fits ``PUZZLES_PER_GAME`` puzzles at the player's pace."""
+        return int(max(MIN_TIME_LIMIT, min(MAX_TIME_LIMIT, PUZZLES_PER_GAME * self.seconds)))
+
+
+def fallback_lengths(target):
+    """Word length range for random pairs of about ``target`` difficulty."""
+    shift = round(LETTERS_PER_DIFFICULTY * (target - PlayerModel().target_difficulty()))
+    shift = max(MIN_WORD_LENGTH - FALLBACK_LENGTHS[0], min(MAX_WORD_LENGTH - FALLBACK_LENGTHS[1], shift))
+    return FALLBACK_LENGTHS[0] + shift, FALLBACK_LENGTHS[1] + shift
+
+
+class DifficultyEngine:
+    """Chooses each pair for a player's model and saves the model after every puzzle."""
+
+    def __init__(self, store, player=PLAYER):
+        self.store = store
+        self.player = player
+        self.model = PlayerModel.from_dict(store.get(player, None))
+
+    def choose(self, pool=None, word_index=None, rng=random):
+        """Return the ``Puzzle`` closest to the target difficulty.
+
+        With a pool this is a binary search over its difficulty-sorted records;
+        otherwise a few random pairs around a matching word length are scored.
+        """
+        target = self.model.target_difficulty()
+        if pool is not None:
+            return pool.draw_near(target, rng)
+        min_length, max_length = fallback_lengths(target)
+        candidates = []
+        while len(candidates) < FALLBACK_CANDIDATES:
+            word1, word2 = word_index.random_pair(min_length, max_length, rng)
+            if word1 != word2:
+                candidates.append(score_pair(word1, word2))
+        return min(candidates, key=lambda puzzle: abs(puzzle.difficulty - target))
+
+    def record(self, puzzle, solved, seconds, mistakes=0):
+        self.model.record(puzzle.difficulty, solved, seconds, mistakes)
+        self.store.set(self.player, self.model.to_dict())
+
+
+_difficulty_engine = None
+
+
+def get_difficulty_engine():
+    """Return the shared difficulty engine for ``LCS_PLAYER``."""
+    global _difficulty_engine
+    if _difficulty_engine is None:
+        store = ScoreStore(PLAYER_FILE)
+        atexit.register(store.close)
+        _difficulty_engine = DifficultyEngine(store)
+    return _difficulty_engine
@@ -0,0 +1,225 @@
+from collections import namedtuple
+
+
+class DPMode:
+    """Recurrence of one two-word alignment DP.
+
+    ``dp[i][j]`` is the value for the prefixes ``a[:i]`` and ``b[:j]``. A
+    matching pair of characters extends the diagonal by ``match``; otherwise
+    the cell is ``pick`` of its upper and left neighbours (and the diagonal
+    when ``substitute`` is set) plus ``gap``. Local modes restart from 0 after
+    every mismatch and report the best cell instead of the last one.
+    """
+
+    def __init__(self, name, pick, match, gap, substitute=False, local=False):
+        self.name = name
+        self.pick = pick
+        self.match = match
+        self.gap = gap
+        self.substitute = substitute
+        self.local = local
+
+    @property
+    def cost(self):
+        """True when lower values are better (edit distance, supersequence length)."""
+        return self.pick is min
+
+    def gap_budget(self, limit, m, n):
+        """Most unmatched characters an alignment with value ``limit`` can have."""
+        # Value = match * (aligned characters) + gap * (unmatched ones), with m + n = 2 * aligned + unmatched
+        return (2 * limit - self.match * (m + n)) // (2 * self.gap - self.match)
+
+
+LCS = DPMode("lcs", max, 1, 0)
+SUBSTRING = DPMode("substring", max, 1, 0, local=True)
+EDIT = DPMode("edit", min, 0, 1, substitute=True)
+SUPERSEQUENCE = DPMode("supersequence", min, 1, 1)
+
+MODES = {mode.name: mode for mode in (LCS, SUBSTRING, EDIT, SUPERSEQUENCE)}
+
+# value: the answer (or limit + 1 when it is over the limit); end: the cell it was read from
+DPResult = namedtuple("DPResult", "value end table")
+
+
+def band(mode, limit, m, n):
+    """Range of ``j - i`` an alignment within ``limit`` can pass through, or None if there is none.
+
+    Reaching a cell off the main diagonal costs at least one gap per step
+    away from it, and getting back to the corner ``(m, n)`` costs the rest.
+    """
+    budget = mode.gap_budget(limit, m, n)
+    if budget < abs(n - m):
+        return None
+    slack = (budget - abs(n - m)) // 2
+    return min(0, n - m) - slack, max(0, n - m) + slack
+
+
+def run(a, b, mode=LCS, limit=None, table=False):
+    """Fill the DP of ``mode`` for ``a`` and ``b`` and return a ``DPResult``.
+
+    Only two rows are kept unless ``table`` asks for the whole matrix (the
+    tutorial draws it and tracebacks walk it). Filling stops as soon as the
+    answer cannot change any more: a maximizing mode that reached its
+    ceiling, or a cost mode whose whole row is already over ``limit``. With a
+    ``limit``, cost modes also skip every cell outside the diagonal band an
+    answer within the limit could use, so checking "at most k edits" costs
+    O(k * len(a)) instead of O(len(a) * len(b)). A requested table is always
+    filled to the end.
+    """
+    m, n = len(a), len(b)
+    pick, match, gap, substitute, local = mode.pick, mode.match, mode.gap, mode.substitute, mode.local
+    over = None
+    low, high = -m, n  # every diagonal
+    if limit is not None and mode.cost:
+        over = limit + 1
+        bounds = band(mode, limit, m, n)
+        if bounds is None:
+            return DPResult(over, (m, n), None)
+        low, high = bounds
+
+    outside = over if over is not None else 0
+    first = [gap * j if j <= high else outside for j in range(n + 1)]
+    rows = [first] if table else None
+    previous, current = first, [outside] * (n + 1)
+    best, end = first[n], (0, n)
+    # A table is always filled completely; otherwise stop once the answer is settled
+    ceiling = min(m, n) if not table else None
+    if local:
+        best, end = 0, (0, 0)
+    elif not mode.cost and best == ceiling:
+        return DPResult(best, end, rows)
+
+    for i in range(1, m + 1):
+        if table:
+            current = [outside] * (n + 1)
+        char = a[i - 1]
+        start, stop = max(1, i + low), min(n, i + high)
+        current[start - 1] = gap * i if start == 1 and i <= -low else outside
+        if stop < n:
+            current[stop + 1] = outside
+        # One loop per kind of recurrence, so the inner loop never checks the mode
+        if local:
+            for j, other in enumerate(b[start - 1:stop], start):
+                current[j] = previous[j - 1] + match if char == other else 0
+        elif substitute:
+            for j, other in enumerate(b[start - 1:stop], start):
+                if char == other:
+                    current[j] = previous[j - 1] + match
+                else:
+                    current[j] = pick(previous[j - 1], previous[j], current[j - 1]) + gap
+        elif pick is max:
+            for j, other in enumerate(b[start - 1:stop], start):
+                if char == other:
+                    current[j] = previous[j - 1] + match
+                else:
+                    up, left = previous[j], current[j - 1]
+                    current[j] = (up if up > left else left) + gap
+        else:
+            for j, other in enumerate(b[start - 1:stop], start):
+                if char == other:
+                    current[j] = previous[j - 1] + match
+                else:
+                    up, left = previous[j], current[j - 1]
+                    current[j] = (up if up < left else left) + gap
+        if table:
+            rows.append(current)
+        if local:
+            row_best = max(current[start:stop + 1], default=0)
+            if row_best > best:
+                best, end = row_best, (i, current.index(row_best, start))
+                if best == ceiling:
+                    break
+        elif over is not None and not table:
+            if min(current[start - 1:stop + 1]) > limit:
+                return DPResult(over, (i, n), rows)
+        elif not mode.cost and current[n] == ceiling:
+            # Every later row ends with the same value
+            return DPResult(ceiling, (i, n), rows)
+        previous, current = current, previous
+
+    if local:
+        return DPResult(best, end, rows)
+    value = previous[n]
+    if over is not None and value > limit:
+        value = over
+    return DPResult(value, (m, n), rows)
+
+
+def lcs_table(a, b):
+    """Full prefix LCS table, as drawn by the tutorial."""
+    return run(a, b, LCS, table=True).table
+
+
+def longest_common_substring(a, b):
+    """One longest string that appears unbroken in both words."""
+    value, (i, _), _ = run(a, b, SUBSTRING)
+    return a[i - value:i]
+
+
+def longest_common_substrings(a, b):
+    """Every distinct longest string that appears unbroken in both words."""
+    value, _, table = run(a, b, SUBSTRING, table=True)
+    if not value:
+        return set()
+    return {a[i - value:i] for i, row in enumerate(table) if value in row}
+
+
+def edit_distance(a, b, limit=None):
+    """Insertions, deletions and substitutions needed to turn ``a`` into ``b``.
+
+    With ``limit``, anything further apart returns ``limit + 1`` after
+    filling only the band of cells within ``limit`` of the diagonal.
+    """
+    return run(a, b, EDIT, limit).value
+
+
+def edit_alignment(a, b):
+    """Edit distance and the positions in ``a`` and ``b`` of the letters an optimal edit keeps."""
+    dp = run(a, b, EDIT, table=True).table
+    i, j = len(a), len(b)
+    kept_a, kept_b = [], []
+    while i > 0 and j > 0:
+        if a[i - 1] == b[j - 1] and dp[i][j] == dp[i - 1][j - 1]:
+            kept_a.append(i - 1)
+            kept_b.append(j - 1)
+            i -= 1
+            j -= 1
+        elif dp[i][j] == dp[i - 1][j - 1] + 1:
+            i -= 1
+            j -= 1
+        elif dp[i][j] == dp[i - 1][j] + 1:
+            i -= 1
+        else:
+            j -= 1
+    return dp[-1][-1], (kept_a[::-1], kept_b[::-1])
+
+
+def supersequence_length(a, b, limit=None):
+    """Length of the shortest word containing both ``a`` and ``b`` as subsequences."""
+    return run(a, b, SUPERSEQUENCE, limit).value
+
+
+def supersequence_alignment(a, b):
+    """One shortest common supersequence and the positions in ``a`` and ``b`` of the letters it shares."""
+    dp = run(a, b, SUPERSEQUENCE, table=True).table
+    i, j = len(a), len(b)
+    chars, shared_a, shared_b = [], [], []
+    while i > 0 and j > 0:
+        if a[i - 1] == b[j - 1]:
+            chars.append(a[i - 1])
+            shared_a.append(i - 1)
+            shared_b.append(j - 1)
+            i -= 1
+            j -= 1
+        elif dp[i - 1][j] <= dp[i][j - 1]:
+            chars.append(a[i - 1])
+            i -= 1
+        else:
+            chars.append(b[j - 1])
+            j -= 1
+    return a[:i] + b[:j] + "".join(reversed(chars)), (shared_a[::-1], shared_b[::-1])
+
+
+def shortest_common_supersequence(a, b):
+    """One shortest word that contains both ``a`` and ``b`` as subsequences."""
+    return supersequence_alignment(a, b)[0]
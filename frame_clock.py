@@ -0,0 +1,113 @@
+import asyncio
+import sys
+import time
+
+import pygame
+from profiler import profiler
+
+# Seconds without input after which a screen with nothing to animate stops drawing frames
+IDLE_AFTER = 3.0
+
+# Longest an idle screen waits for input before it draws a frame anyway
+IDLE_WAIT_MS = 250
+
+# Video drivers where SDL really sleeps in pygame.event.wait; elsewhere (dummy, kmsdrm, the browser)
+# it polls every millisecond, so idle screens sleep and check for input this often instead.
+# Async loops always poll, since a blocking wait would stall every other task.
+BLOCKING_DRIVERS = {"x11", "wayland", "windows", "cocoa"}
+IDLE_POLL_MS = 50
+
+
+class AsyncClock:
+    """Async counterpart of ``pygame.time.Clock`` for loops running on asyncio.
+
+    ``tick`` sleeps on the event loop for the rest of the frame instead of
+    blocking in SDL, so other tasks (and the browser, under pygbag) run in
+    between frames.
+    """
+
+    def __init__(self):
+        self.last_tick = time.perf_counter()
+
+    async def tick(self, framerate=0):
+        """Wait until the next frame is due and return the elapsed milliseconds."""
+        if framerate:
+            remaining = 1 / framerate - (time.perf_counter() - self.last_tick)
+            await asyncio.sleep(max(0.0, remaining))
+        else:
+            await asyncio.sleep(0)
+        now = time.perf_counter()
+        elapsed = now - self.last_tick
+        self.last_tick = now
+        return int(elapsed * 1000)
+
+
+class FramePacer:
+    """Paces a screen that only needs frames while something moves or the player is active.
+
+    While busy, or within ``idle_after`` seconds of the last input, it runs
+    at ``framerate`` like a normal clock. After that it blocks in
+    ``pygame.event.wait`` until input arrives, waking ``idle_framerate``
+    times a second for animations that keep running (0: only on input).
+    Where the video driver cannot block, and always on asyncio, it sleeps
+    and polls instead.
+    """
+
+    def __init__(self, framerate, idle_framerate=0, idle_after=IDLE_AFTER):
+        self.framerate = framerate
+        self.idle_framerate = idle_framerate
+        self.idle_after = idle_after
+        self.clock = AsyncClock()
+        self.sync_clock = pygame.time.Clock()
+        self.last_input = time.perf_counter()
+
+    def idle(self, busy=False):
+        return not busy and not profiler.enabled and time.perf_counter() - self.last_input >= self.idle_after
+
+    def idle_timeout(self):
+        """Milliseconds an idle screen may wait for input before its next frame."""
+        return int(1000 / self.idle_framerate) if self.idle_framerate else IDLE_WAIT_MS
+
+    def can_block(self):
+        return sys.platform != "emscripten" and pygame.display.get_driver() in BLOCKING_DRIVERS
+
+    def poll_interval(self):
+        return min(self.idle_timeout(), IDLE_POLL_MS) / 1000
+
+    def got(self, events):
+        if events:
+            self.last_input = time.perf_counter()
+        return events
+
+    def sleep_until_input(self):
+        deadline = time.perf_counter() + self.idle_timeout() / 1000
+        while time.perf_counter() < deadline and not pygame.event.peek():
+            time.sleep(self.poll_interval())
+        self.clock.last_tick = time.perf_counter()
+
+    def wait_for_input(self):
+        event = pygame.event.wait(self.idle_timeout())
+        self.clock.last_tick = time.perf_counter()
+        events = [] if event.type == pygame.NOEVENT else [event]
+        return self.got(events + pygame.event.get())
+
+    def wait(self, busy=False):
+        """Wait until the next frame is due and return the events that arrived."""
+        if not self.idle(busy):
+            self.sync_clock.tick(self.framerate)
+        elif self.can_block():
+            return self.wait_for_input()
+        else:
+            self.sleep_until_input()
+        return self.got(pygame.event.get())
+
+    async def wait_async(self, busy=False):
+        """Same as ``wait`` on the asyncio event loop; idle screens poll so other tasks keep running."""
+        if not self.idle(busy):
+            await self.clock.tick(self.framerate)
+        else:
+            deadline = time.perf_counter() + self.idle_timeout() / 1000
+            while time.perf_counter() < deadline and not pygame.event.peek():
+                await asyncio.sleep(self.poll_interval())
+            self.clock.last_tick = time.perf_counter()
+        return self.got(pygame.event.get())
@@ -0,0 +1,105 @@
+import os
+import random
+
+
+def enable_headless():
+    """Route SDL video and audio to dummy drivers.
+
+    Must run before the game window is created (the first ``get_screen``
+    call), since SDL reads the drivers once.
+    """
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+
+class VirtualClock:
+    """Drop-in for ``pygame.time.Clock`` whose time only advances on ``tick``.
+
+    Pass ``clock.time`` as the game's ``time_source`` so timers and
+    animations run as fast as the CPU allows while behaving as if every
+    frame took exactly ``1 / framerate`` seconds.
+    """
+
+    def __init__(self, start=0.0):
+        self.now = start
+        self.frames = 0
+
+    def time(self):
+        return self.now
+
+    def tick(self, framerate=0):
+        elapsed = 1 / framerate if framerate else 0.0
+        self.now += elapsed
+        self.frames += 1
+        return int(round(elapsed * 1000))
+
+
+def key_event(key, unicode=""):
+    import pygame
+
+    return pygame.event.Event(pygame.KEYDOWN, key=key, unicode=unicode)
+
+
+class ScriptedEvents:
+    """Event source that replays ``(frame, event)`` pairs, one frame per call."""
+
+    def __init__(self, script):
+        self.script = sorted(script, key=lambda item: item[0])
+        self.position = 0
+        self.frame = 0
+
+    @property
+    def done(self):
+        return self.position >= len(self.script)
+
+    def __call__(self):
+        events = []
+        while self.position < len(self.script) and self.script[self.position][0] <= self.frame:
+            events.append(self.script[self.position][1])
+            self.position += 1
+        self.frame += 1
+        return events
+
+
+class AutoPlayer:
+    """Event source that plays the game like a person, driven by a seeded RNG.
+
+    For every new pair it either asks for the solution or types the answer a
+    few keys per second and submits it, sometimes dropping a letter to
+    produce a wrong answer. Attach the game with ``player.game = game``.
+    """
+
+    def __init__(self, seed=0, frames_per_key=8, mistake_rate=0.15, reveal_rate=0.05):
+        self.rng = random.Random(seed)
+        self.frames_per_key = frames_per_key
+        self.mistake_rate = mistake_rate
+        self.reveal_rate = reveal_rate
+        self.game = None
+        self.pair = None
+        self.pending = []
+        self.wait = 0
+
+    def plan(self):
+        import pygame
+        from lcs_engine import lcs
+
+        self.pair = self.game.current_pair
+        if self.rng.random() < self.reveal_rate:
+            self.pending = [key_event(pygame.K_SPACE)]
+            return
+        answer = lcs(*self.pair)
+        if answer and self.rng.random() < self.mistake_rate:
+            answer = answer[:-1]
+        self.pending = [key_event(ord(char.lower()), char.lower()) for char in answer]
+        self.pending.append(key_event(pygame.K_RETURN))
+
+    def __call__(self):
+        if self.game is None or self.game.game_state != "playing":
+            return []
+        if self.game.current_pair != self.pair or (not self.pending and not self.game.user_sequence):
+            self.plan()
+        if self.wait > 0:
+            self.wait -= 1
+            return []
+        self.wait = self.frames_per_key
+        return [self.pending.pop(0)] if self.pending else []
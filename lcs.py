@@ -1,150 +1,285 @@
 import pygame
 import random
 import time
-import nltk
 import math
-import os
-from collections import defaultdict
-from settings import WIDTH, HEIGHT, FONT, WHITE, BLACK, GREEN, RED, DARK_GREEN, GRAY, FONT_PATH
-from menu import save_highest_score, load_highest_score, save_highest_level, load_highest_level
+from settings import WIDTH, HEIGHT, WHITE, BLACK, GREEN, RED, DARK_GREEN, GRAY
+from app import get_screen
+from assets import get_background
+from corpus import get_word_index
+from lcs_engine import lcs, is_subsequence, IncrementalMatcher, LCSSolutions
+from puzzles import get_puzzle_pool
+from difficulty import get_difficulty_engine
+from text_cache import render_text
+from renderer import DirtyRenderer
+from audio import get_audio
+from animation import Animation, Sequence, Scheduler
+from frame_clock import AsyncClock
+from scores import get_score_store
+from leaderboard import get_leaderboard
+from profiler import profiler
+
+# A finished game that reaches this place on the daily leaderboard gets a message
+DAILY_RANK_SHOWN = 10
 
-nltk.download("words")
-
-screen = pygame.display.set_mode((WIDTH, HEIGHT))
-
-BASE_DIR = os.path.dirname(os.path.abspath(__file__)) 
-
-CORRECT_SFX_PATH = os.path.join(BASE_DIR, "assets", "correct.mp3")
-
-WIN_SFX_PATH = os.path.join(BASE_DIR, "assets", "win.wav")
-
-WRONG_SFX_PATH = os.path.join(BASE_DIR, "assets", "wrong.mp3")
-
-BG_IMAGE_PATH = os.path.join(BASE_DIR, "assets", "sun.png") 
 
 class LCSGame:
-    def __init__(self):
-        self.screen_width, self.screen_height = screen.get_size()
+    title = "LCS Game!"
+    controls = ["ENTER: submit", "BACKSPACE: delete", "SPACE: see solution", "ESC: Exit"]
+    sequence_label = "Your sequence:"
+    invalid_hint = "Not in both words"
+    # Modes off the pair difficulty scale neither update the player's model nor go on the boards
+    ranked = True
+    # Off for replays, which must not save scores or leaderboard runs
+    persist = True
+
+    def __init__(self, event_source=pygame.event.get, time_source=time.time, seed=None, recorder=None):
+        # Injectable so the game can be driven headless by scripts and a virtual clock
+        self.event_source = event_source
+        self.time_source = time_source
+        # Every random choice goes through one seeded RNG so a session can be replayed
+        self.seed = random.getrandbits(64) if seed is None else seed
+        self.rng = random.Random(self.seed)
+        self.recorder = recorder
+        self.screen = get_screen()
+        self.screen_width, self.screen_height = self.screen.get_size()
         self.center_x = self.screen_width // 2
         self.center_y = self.screen_height // 2
 
         # Improved fonts with better sizing
-        self.title_font = pygame.font.Font(None, int(self.screen_height * 0.08))
-        self.font = pygame.font.Font(None, int(self.screen_height * 0.05))
-        self.small_font = pygame.font.Font(None, int(self.screen_height * 0.03))
+        self.font_size = int(self.screen_height * 0.05)
+        self.small_font_size = int(self.screen_height * 0.03)
         
         # load BG
-        self.bg_image = pygame.image.load(BG_IMAGE_PATH)
-        self.bg_image = pygame.transform.scale(self.bg_image, (WIDTH, HEIGHT))
+        self.bg_image = get_background()
 
-        self.screen = pygame.display.set_mode((WIDTH, HEIGHT))
-        pygame.display.set_caption("LCS Algorithm Game")
+        self.background = self.build_background()
+        self.black_background = pygame.Surface((WIDTH, HEIGHT))
+        self.black_background.fill(BLACK)
+        self.renderer = DirtyRenderer(self.screen, self.background)
         self.score = 0
         self.level = 1
         self.running = True
         self.game_state = "playing"
-        self.word_list = nltk.corpus.words.words()
-        self.current_pair = self.get_new_word_pair()
-        self.user_sequence = ""
+        self.word_index = get_word_index()
+        self.audio = get_audio()
+        self.puzzle_pool = get_puzzle_pool()
+        self.difficulty = get_difficulty_engine()
+        if self.recorder is not None:
+            self.recorder.start(self)
+        self.next_pair()
         self.correct_sequence = None
-        self.start_time = time.time()
-        self.time_limit = 60
+        self.start_time = self.time_source()
+        # Long enough for a handful of puzzles at this player's usual pace
+        self.time_limit = self.difficulty.model.time_limit()
 
         # Animation variables
         self.animation_counter = 0
         self.animation_speed = 2
+        self.scheduler = Scheduler()
+        self.input_buffer = []
 
     def draw_rounded_rect(self, surface, rect, color, radius=20):
         """Draw a rounded rectangle"""
         pygame.draw.rect(surface, color, rect, border_radius=radius)
 
-    def generate_random_word_pair(self, min_length=5, max_length=10):
-        filtered_words = [word.upper() for word in self.word_list if min_length <= len(word) <= max_length]
-        if len(filtered_words) < 2:
-            raise ValueError("Not enough words available in the specified length range.")
-        word1 = random.choice(filtered_words)
-        word2 = random.choice(filtered_words)
-        return word1, word2
-
     def get_new_word_pair(self):
-        return self.generate_random_word_pair()
+        # The pair is picked for the player's skill; the pool is pre-scored so no LCS work is needed
+        self.current_puzzle = self.difficulty.choose(self.puzzle_pool, self.word_index, self.rng)
+        return self.current_puzzle.word1, self.current_puzzle.word2
+
+    def next_pair(self):
+        """Move on to a new word pair and clear the typed sequence."""
+        self.current_pair = self.get_new_word_pair()
+        if self.recorder is not None:
+            self.recorder.pair(self.current_pair)
+        self.user_sequence = ""
+        self.puzzle_started = self.time_source()
+        self.mistakes = 0
+        with profiler.section("lcs"):
+            self.solutions, self.matcher = self.solve(self.current_pair)
+
+    def solve(self, words):
+        """Return every optimal answer for the words and the live input matcher sharing its tables."""
+        solutions = LCSSolutions(*words)
+        return solutions, IncrementalMatcher(*words, solutions=solutions)
+
+    def record_puzzle(self, solved):
+        """Feed the finished puzzle to the player's difficulty model."""
+        if not self.ranked:
+            return
+        seconds = self.time_source() - self.puzzle_started
+        self.difficulty.record(self.current_puzzle, solved, seconds, self.mistakes)
 
     def check_user_sequence(self):
-        word1, word2 = self.current_pair
-        return self.is_subsequence(self.user_sequence, word1) and self.is_subsequence(self.user_sequence, word2)
-
-    def run(self):
-        pygame.mixer.init()
-        clock = pygame.time.Clock()
-        while self.running:
-            for event in pygame.event.get():
-                self.event = event
-                action = self.handle_input(event)
-                if action == "exit_to_menu":
+        # The matcher follows every keystroke, so no rescan of the words is needed
+        return self.matcher.valid
+
+    def run(self, clock=None):
+        clock = clock or pygame.time.Clock()
+        try:
+            while self.running:
+                dt = clock.tick(60) / 1000
+                if self.step(dt) == "exit_to_menu":
                     return "exit_to_menu"
-            time_remaining = max(0, self.time_limit - (time.time() - self.start_time))
-            self.draw_screen(time_remaining)
-            if time_remaining <= 0:
-                self.running = False
-            
-            self.animation_counter += self.animation_speed
-            pygame.display.flip()
-            clock.tick(60)
 
+            self.stop_effects()
+            self.finish_game()
+            # Play the congratulation messages while still pumping events
+            while self.scheduler.busy:
+                dt = clock.tick(60) / 1000
+                if self.step(dt) == "exit_to_menu":
+                    self.scheduler.clear()
+        finally:
+            self.stop_recording()
 
-        highest_score = load_highest_score()
-        highest_level = load_highest_level()
-        new_high_score = self.score > highest_score
-        new_high_level = self.level > highest_level
-        
-        if new_high_score or new_high_level:
-            if new_high_level:
-                save_highest_level(self.level)
-                self.show_congratulations(f"New High Level: {self.level}!")
-            if new_high_score:
-                save_highest_score(self.score)
-                self.show_congratulations(f"New High Score: {self.score}!")
-        
         print(f"Final Score: {self.score}")
         print(f"Final Level: {self.level}")
 
-    def draw_screen(self, time_remaining):
+    async def run_async(self):
+        """Same as ``run`` but yields to the asyncio event loop every frame."""
+        clock = AsyncClock()
+        try:
+            while self.running:
+                dt = await clock.tick(60) / 1000
+                if self.step(dt) == "exit_to_menu":
+                    return "exit_to_menu"
 
-        # self.screen.fill(BLACK)
-        # เพิ่ม background
-        self.screen.blit(self.bg_image, (0, 0))
+            self.stop_effects()
+            self.finish_game()
+            while self.scheduler.busy:
+                dt = await clock.tick(60) / 1000
+                if self.step(dt) == "exit_to_menu":
+                    self.scheduler.clear()
+        finally:
+            self.stop_recording()
 
-        pulse = abs(math.sin(self.animation_counter / 30)) * 10
-        title_size = int(self.screen_height * 0.08 + pulse)
-        title_font = pygame.font.Font(FONT_PATH, title_size)
-        title_text = title_font.render("LCS Game!", True, BLACK)
-        title_rect = title_text.get_rect(center=(self.center_x, self.screen_height // 10))
-        screen.blit(title_text, title_rect)
+        print(f"Final Score: {self.score}")
+        print(f"Final Level: {self.level}")
+
+    def stop_effects(self):
+        """Drop effects still playing and keys typed during them once time is up."""
+        self.scheduler.clear()
+        self.input_buffer.clear()
+
+    def stop_recording(self):
+        if self.recorder is not None:
+            self.recorder.close()
+
+    def step(self, dt):
+        """Advance the game by one frame of ``dt`` seconds."""
+        if self.recorder is not None:
+            self.recorder.frame(dt)
+        with profiler.section("events"):
+            for event in self.event_source():
+                self.event = event
+                if profiler.handle_event(event):
+                    continue
+                if event.type == pygame.KEYDOWN and event.key != pygame.K_ESCAPE and not self.running:
+                    continue  # time is up: only Escape (skip the messages) still does anything
+                if self.scheduler.busy and event.type == pygame.KEYDOWN and event.key != pygame.K_ESCAPE:
+                    # Keep keystrokes typed during an effect and apply them once it ends
+                    self.input_buffer.append(event)
+                    continue
+                action = self.handle_input(event)
+                if action == "exit_to_menu":
+                    return action
+
+        with profiler.section("effects"):
+            self.scheduler.update(dt)
+            while self.input_buffer and not self.scheduler.busy and self.running:
+                self.handle_input(self.input_buffer.pop(0))
+
+        time_remaining = max(0, self.time_limit - (self.time_source() - self.start_time))
+        with profiler.section("render"):
+            if self.game_state == "playing":
+                self.draw_screen(time_remaining)
+            profiler.draw_overlay(self.renderer)
+            self.renderer.present()
+        if time_remaining <= 0:
+            self.running = False
+        
+        self.animation_counter += self.animation_speed
+        profiler.frame()
+
+    def finish_game(self):
+        """Save new records and queue their congratulation messages."""
+        self.game_state = "congratulations"
+        if not (self.ranked and self.persist):
+            return
+        scores = get_score_store()
+        new_high_score = self.score > scores.get("highest_score")
+        new_high_level = self.level > scores.get("highest_level")
+        duration = self.time_source() - self.start_time
+        scores.record_run(self.score, self.level, duration, self.difficulty.player)
+        leaderboard = get_leaderboard()
+        leaderboard.record_run(self.difficulty.player, self.score, self.level, duration)
+        daily_rank = leaderboard.rank(self.score, "day")
+
+        messages = []
+        if new_high_level:
+            messages.append(self.congratulations_effect(f"New High Level: {self.level}!"))
+        if new_high_score:
+            messages.append(self.congratulations_effect(f"New High Score: {self.score}!"))
+        if self.score and daily_rank <= DAILY_RANK_SHOWN:
+            messages.append(self.congratulations_effect(f"#{daily_rank} on Today's Board!"))
+        if messages:
+            self.scheduler.add(Sequence(messages))
+
+    def build_background(self):
+        """Pre-composite the parts of the game screen that never change."""
+        background = self.bg_image.copy()
 
         add_y = 100
         control_rect = pygame.Rect(30, 30+ add_y, 964, 420)
-        self.draw_rounded_rect(screen, control_rect, GRAY)
+        self.draw_rounded_rect(background, control_rect, GRAY)
 
         control_rect = pygame.Rect(40, 40+add_y, 944, 95)
-        self.draw_rounded_rect(screen, control_rect, DARK_GREEN)
+        self.draw_rounded_rect(background, control_rect, DARK_GREEN)
 
         control_rect = pygame.Rect(40, 170+add_y, 944, 90)
-        self.draw_rounded_rect(screen, control_rect, WHITE)
+        self.draw_rounded_rect(background, control_rect, WHITE)
+
+        self.draw_controls(background)
+        return background
+
+    def draw_screen(self, time_remaining):
+        """Describe the dynamic widgets; the renderer redraws only those that changed."""
+        pulse = abs(math.sin(self.animation_counter / 30)) * 10
+        title_size = int(self.screen_height * 0.08 + pulse)
+        title_text = render_text(self.title, BLACK, title_size)
+        title_rect = title_text.get_rect(center=(self.center_x, self.screen_height // 10))
+        self.renderer.draw("title", title_text, title_rect)
 
-        word1, word2 = self.current_pair
-        self.screen.blit(FONT.render(f"Word 1: {word1}", True, WHITE), (50, 50+add_y))
-        self.screen.blit(FONT.render(f"Word 2: {word2}", True, WHITE), (50, 100+add_y))
+        add_y = 100
+        self.draw_words()
         sequence_color = GREEN if self.game_state == "playing" else RED
-        self.screen.blit(FONT.render(f"Your sequence:", True, sequence_color), (50, 200+add_y))
-        self.screen.blit(FONT.render(f"{self.user_sequence}", True, BLACK), (280, 200+add_y))
-        self.screen.blit(FONT.render(f"Score: {self.score}", True, WHITE), (50, 300+add_y))
-        self.screen.blit(FONT.render(f"Level: {self.level}", True, WHITE), (50, 350+add_y))
-        self.screen.blit(FONT.render(f"Time: {int(time_remaining)}s", True, WHITE), (50, 400+add_y))
+        self.renderer.draw("sequence_label", render_text(self.sequence_label, sequence_color), (50, 200+add_y))
+        # Live feedback: the sequence turns red as soon as it stops fitting both words
+        valid = self.matcher.valid
+        self.renderer.draw("sequence", render_text(f"{self.user_sequence}", BLACK if valid else RED), (280, 200+add_y))
+        hint, hint_color = self.hint()
+        hint_text = render_text(hint, hint_color, self.small_font_size)
+        self.renderer.draw("hint", hint_text, hint_text.get_rect(topright=(970, 205+add_y)))
+        self.renderer.draw("score", render_text(f"Score: {self.score}", WHITE), (50, 300+add_y))
+        self.renderer.draw("level", render_text(self.progress_text(), WHITE), (50, 350+add_y))
+        self.renderer.draw("time", render_text(f"Time: {int(time_remaining)}s", WHITE), (50, 400+add_y))
         
-        self.draw_controls()
+    def draw_words(self):
+        for number, word in enumerate(self.current_pair, 1):
+            self.renderer.draw(f"word{number}", render_text(f"Word {number}: {word}", WHITE), (50, 100 + number * 50))
+
+    def hint(self):
+        """Text and color of the live feedback next to the typed sequence."""
+        if self.matcher.valid:
+            return f"Can still add: {self.matcher.remaining}", DARK_GREEN
+        return self.invalid_hint, RED
+
+    def progress_text(self):
+        return f"Level: {self.level}"
+
+    def points(self, sequence):
+        return len(sequence) * 10
 
-        pygame.display.flip()
-        
     def handle_input(self, event):
         if event.type == pygame.QUIT:
             self.running = False
@@ -153,64 +288,63 @@ class LCSGame:
                 self.running = False
                 return "exit_to_menu"
             elif event.key == pygame.K_RETURN:
-                if self.check_user_sequence():
-                    correct_lcs = self.find_lcs(*self.current_pair)
-                    if len(self.user_sequence) == len(correct_lcs):
-                        try:
-                            correct_sound = pygame.mixer.Sound(CORRECT_SFX_PATH)  
-                            correct_sound.play()
-                        except Exception as e:
-                            print("Error loading sound:", e)
-                        self.score += len(self.user_sequence) * 10
-                        self.level += 1
-                        self.current_pair = self.get_new_word_pair()
-                        self.user_sequence = ""
-                        self.game_state = "playing"
-                    else:
-                        self.wrong_answer_effect()
+                # Any of the optimal answers is accepted, not only the one find_lcs returns
+                if self.check_user_sequence() and self.user_sequence in self.solutions:
+                    self.audio.play("correct")
+                    self.score += self.points(self.user_sequence)
+                    self.level += 1
+                    self.record_puzzle(True)
+                    self.next_pair()
+                    self.game_state = "playing"
                 else:
+                    self.mistakes += 1
                     self.wrong_answer_effect()
             elif event.key == pygame.K_BACKSPACE:
-                self.user_sequence = self.user_sequence[:-1]
+                if self.user_sequence:
+                    self.user_sequence = self.user_sequence[:-1]
+                    self.matcher.pop()
             elif event.key == pygame.K_SPACE:
+                self.record_puzzle(False)
                 self.correct_sequence = self.find_lcs(*self.current_pair)
                 self.game_state = "showing_solution"
                 self.highlight_correct_sequence()
             elif event.unicode.isalpha():
-                self.user_sequence += event.unicode.upper()
+                char = event.unicode.upper()
+                self.user_sequence += char
+                self.matcher.push(char)
     
     def highlight_correct_sequence(self):
-        """Highlight correct LCS sequence for 3 seconds."""
-        word1, word2 = self.current_pair
+        """Show the solution card for 2 seconds, then move on to a new pair."""
         lcs = self.correct_sequence
 
-        def render_word_with_highlight(word, lcs):
-            """Returns a rendered word where LCS characters are highlighted in GREEN."""
+        def render_word_with_highlight(word, indices):
+            """Returns a rendered word where the matched LCS characters are highlighted in GREEN."""
             text_surface = pygame.Surface((WIDTH, HEIGHT), pygame.SRCALPHA)
             x, y = 50, 50  # Position of words
             offset_x = 0
 
-            for char in word:
-                color = GREEN if char in lcs else WHITE
-                char_surface = FONT.render(char, True, color)
+            for index, char in enumerate(word):
+                color = GREEN if index in indices else WHITE
+                char_surface = render_text(char, color)
                 text_surface.blit(char_surface, (x + offset_x, y))
                 offset_x += char_surface.get_width() + 5  # Space between characters
             return text_surface
 
-        # Highlight LCS in both words
-        word1_surface = render_word_with_highlight(word1, lcs)
-        word2_surface = render_word_with_highlight(word2, lcs)
+        # Highlight LCS in every word
+        word_surfaces = [render_word_with_highlight(word, set(indices))
+                         for word, indices in zip(self.current_pair, self.solutions.matched_indices(lcs))]
+        # Each word past the second adds a row to the card
+        extra_height = 60 * (len(self.current_pair) - 2)
 
-        # self.screen.fill(BLACK)
-        self.screen.blit(self.bg_image, (0, 0))
+        solution_screen = self.bg_image.copy()
 
         card_rect = pygame.Rect(
             self.center_x - 300,
             self.screen_height // 4 - 50,
             600,
-            300
+            300 + extra_height
         )
-        self.draw_rounded_rect(screen, card_rect, GRAY)
+        self.draw_rounded_rect(solution_screen, card_rect, GRAY)
 
         number_rect = pygame.Rect(
             card_rect.left + 20,
@@ -218,20 +352,17 @@ class LCSGame:
             200,
             40
         )
-        self.draw_rounded_rect(screen, number_rect, DARK_GREEN)
+        self.draw_rounded_rect(solution_screen, number_rect, DARK_GREEN)
 
-        example_text = self.font.render(f"Solution", True, WHITE)
+        example_text = render_text(f"Solution", WHITE, self.font_size, None)
         example_rect = example_text.get_rect(center=number_rect.center)
-        screen.blit(example_text, example_rect)
+        solution_screen.blit(example_text, example_rect)
 
-        self.screen.blit(FONT.render('Word 1:', True, WHITE), (270, 240))
+        for row, word_surface in enumerate(word_surfaces):
+            solution_screen.blit(render_text(f'Word {row + 1}:', WHITE), (270, 240 + row * 60))
+            solution_screen.blit(word_surface, (370, 190 + row * 60))
 
-        self.screen.blit(FONT.render('Word 2:', True, WHITE), (270, 300))
-
-        self.screen.blit(word1_surface, (370, 190))
-        self.screen.blit(word2_surface, (370, 250))
-
-        y_offset = card_rect.top + 100
+        y_offset = card_rect.top + 100 + extra_height
 
         result_rect = pygame.Rect(
             card_rect.left + 50,
@@ -240,107 +371,83 @@ class LCSGame:
             60
         )
 
-        self.draw_rounded_rect(screen, result_rect, DARK_GREEN)
-        result_text = self.font.render(f"Solution: {lcs}", True, WHITE)
+        self.draw_rounded_rect(solution_screen, result_rect, DARK_GREEN)
+        result_text = render_text(f"Solution: {lcs}", WHITE, self.font_size, None)
         result_rect = result_text.get_rect(center=(result_rect.centerx, result_rect.centery))
-        screen.blit(result_text, result_rect)
+        solution_screen.blit(result_text, result_rect)
 
-        self.draw_controls()
+        self.draw_controls(solution_screen)
         
-        pygame.display.flip()
+        def finish():
+            if not self.running:
+                return
+            self.next_pair()
+            self.game_state = "playing"  # Return to normal gameplay
+            self.renderer.set_background(self.background)
 
-        pygame.time.delay(2000)  # Show for 3 seconds
-        self.current_pair = self.get_new_word_pair()
-        self.user_sequence = ""
-        self.game_state = "playing"  # Return to normal gameplay
-
-                
-    def show_congratulations(self, message):
-        """Displays a congratulatory message on the screen."""
-        self.screen.fill(BLACK)
-        congrats_text = FONT.render(message, True, GREEN)
-        text_rect = congrats_text.get_rect(center=(WIDTH // 2, HEIGHT // 2))
-        self.screen.blit(congrats_text, text_rect)
-        pygame.display.flip()
-        
-        try:
-            win_sound = pygame.mixer.Sound(WIN_SFX_PATH)  
-            win_sound.play()
-        except Exception as e:
-            print("Error loading sound:", e)
-        
-        pygame.time.delay(2000)  # Show message for 2 seconds
+        self.renderer.set_background(solution_screen)
+        self.scheduler.add(Animation(2.0, on_finish=finish))
+
+    def congratulations_effect(self, message):
+        """Build the animation that shows a congratulatory message for 2 seconds."""
+        def start():
+            self.renderer.set_background(self.black_background)
+            self.audio.play("win")
+
+        def update(progress):
+            congrats_text = render_text(message, GREEN)
+            text_rect = congrats_text.get_rect(center=(WIDTH // 2, HEIGHT // 2))
+            self.renderer.draw("congratulations", congrats_text, text_rect)
+
+        return Animation(2.0, on_update=update, on_start=start)
 
     def wrong_answer_effect(self):
+        """Shake the words on a black screen, then clear the typed sequence."""
         original_x, original_y = 50, 50  # Original position of the word
         shake_amount = 5  # Number of pixels the word will "shake"
         shake_count = 10  # Number of shakes
-        shake_delay = 70  # Delay between shakes in milliseconds
-        
-        try:
-            error_sound = pygame.mixer.Sound(WRONG_SFX_PATH)  # Ensure the file exists
-            error_sound.play()
-        except Exception as e:
-            print("Error loading sound:", e)
-        
-        # Shake effect
+        shake_delay = 0.07  # Delay between shakes in seconds
+        offsets = [
+            (self.rng.randint(-shake_amount, shake_amount), self.rng.randint(-shake_amount, shake_amount))
+            for _ in range(shake_count)
+        ]
         
-        for _ in range(shake_count):
-            offset_x = random.randint(-shake_amount, shake_amount)
-            offset_y = random.randint(-shake_amount, shake_amount)
-            self.screen.fill(BLACK)  # Fill screen with black for clean slate
-            word1, word2 = self.current_pair  # Get current words to display
-            self.screen.blit(FONT.render(f"Word 1: {word1}", True, WHITE), (original_x + offset_x, original_y + offset_y))
-            self.screen.blit(FONT.render(f"Word 2: {word2}", True, WHITE), (original_x + offset_x, original_y + 50 + offset_y))
+        self.audio.play("wrong")
+        self.game_state = "wrong_answer"
+        self.renderer.set_background(self.black_background)
+
+        def shake(progress):
+            offset_x, offset_y = offsets[min(int(progress * shake_count), shake_count - 1)]
+            for row, word in enumerate(self.current_pair):  # Get current words to display
+                self.renderer.draw(f"shake_word{row + 1}", render_text(f"Word {row + 1}: {word}", WHITE), (original_x + offset_x, original_y + row * 50 + offset_y))
             if (self.user_sequence != ""):
-                self.screen.blit(FONT.render(f"Your sequence: {self.user_sequence}", True, RED), (original_x + offset_x, original_y + 150 + offset_y))
-            pygame.display.flip()
-            pygame.time.delay(shake_delay)
-        
-        # Clear screen or make the word disappear after shake
-        self.screen.fill(BLACK)  # Clear screen
-        pygame.display.flip()
+                sequence_y = original_y + (len(self.current_pair) + 1) * 50
+                self.renderer.draw("shake_sequence", render_text(f"Your sequence: {self.user_sequence}", RED), (original_x + offset_x, sequence_y + offset_y))
+
+        def finish():
+            if not self.running:
+                return
+            # Reset user sequence after shake effect
+            self.user_sequence = ""  # Reset user input
+            self.matcher.reset()
+            self.game_state = "playing"  # Return to playing state
+            self.renderer.set_background(self.background)
 
-        # Reset user sequence after shake effect
-        self.user_sequence = ""  # Reset user input
-        self.game_state = "playing"  # Return to playing state
+        self.scheduler.add(Animation(shake_count * shake_delay, on_update=shake, on_finish=finish))
 
     def find_lcs(self, str1, str2):
-        m, n = len(str1), len(str2)
-        pos = defaultdict(list)
-        for j in range(n):
-            pos[str2[j]].append(j)
-        lcs = []
-        last_j = -1
-        for i in range(m):
-            if str1[i] in pos:
-                for j in reversed(pos[str1[i]]):
-                    if j > last_j:
-                        lcs.append(str1[i])
-                        last_j = j
-                        break
-        return ''.join(lcs)
+        with profiler.section("lcs"):
+            return lcs(str1, str2)
 
     def is_subsequence(self, s, t):
-        s_idx = 0
-        for char in t:
-            if s_idx < len(s) and char == s[s_idx]:
-                s_idx += 1
-        return s_idx == len(s)
+        return is_subsequence(s, t)
     
-    def draw_controls(self):
+    def draw_controls(self, surface):
         # Draw controls in a bottom bar
         control_rect = pygame.Rect(0, self.screen_height - 60, self.screen_width, 60)
-        self.draw_rounded_rect(screen, control_rect, DARK_GREEN)
-        
-        controls = [
-            "ENTER: submit",
-            "BACKSPACE: delete",
-            "SPACE: see solution",
-            "ESC: Exit"
-        ]
-        
-        for i, control in enumerate(controls):
-            text = self.small_font.render(control, True, WHITE)
-            x_pos = self.screen_width // 5 * (i + 1) - text.get_width() // 2
-            screen.blit(text, (x_pos, self.screen_height - 37))
+        self.draw_rounded_rect(surface, control_rect, DARK_GREEN)
+
+        for i, control in enumerate(self.controls):
+            text = render_text(control, WHITE, self.small_font_size, None)
+            x_pos = self.screen_width // (len(self.controls) + 1) * (i + 1) - text.get_width() // 2
+            surface.blit(text, (x_pos, self.screen_height - 37))
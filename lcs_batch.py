@@ -0,0 +1,237 @@
+import argparse
+import functools
+import random
+import sys
+import time
+from multiprocessing import Pool
+
+try:
+    import numpy as np
+except ImportError:  # only this offline tool needs NumPy, so the game installs without it
+    np = None
+
+# Pairs handed to each worker process
+CHUNK_SIZE = 20000
+
+
+def require_numpy():
+    if np is None:
+        raise ImportError("lcs_batch needs NumPy: pip install numpy")
+
+
+def encode(words, width=None):
+    """Encode words as a zero-padded ``(len(words), width)`` array of code points plus their lengths."""
+    width = max(width or 0, max(map(len, words), default=0), 1)
+    codes = np.array(words, dtype=f"<U{width}").view(np.uint32).reshape(len(words), width)
+    lengths = np.fromiter(map(len, words), dtype=np.int32, count=len(words))
+    return codes, lengths
+
+
+def lcs_lengths(a, a_lengths, b, b_lengths):
+    """LCS length of every row pair of two encoded batches.
+
+    The DP advances one character of ``a`` at a time for all pairs at once;
+    each row is a running maximum along ``b`` (as in ``lcs_engine.NumpyBackend``),
+    so a batch costs ``width(a)`` rounds of whole-array operations.
+    """
+    count = len(a)
+    row = np.zeros((count, b.shape[1] + 1), dtype=np.int32)
+    candidates = np.empty((count, b.shape[1]), dtype=np.int32)
+    for i in range(a.shape[1]):
+        char = a[:, i:i + 1]
+        # Padding (code 0) never matches: real characters in ``b`` are non-zero
+        matches = (b == char) & (char != 0)
+        np.add(row[:, :-1], matches, out=candidates)
+        np.maximum(candidates, row[:, 1:], out=candidates)
+        np.maximum.accumulate(candidates, axis=1, out=row[:, 1:])
+    return row[np.arange(count), b_lengths]
+
+
+def subsequence_mask(s, s_lengths, t, t_lengths):
+    """Boolean array: is row ``k`` of ``s`` a subsequence of row ``k`` of ``t``?"""
+    count = len(s)
+    rows = np.arange(count)
+    position = np.zeros(count, dtype=np.int32)
+    last = s.shape[1] - 1
+    for j in range(t.shape[1]):
+        wanted = s[rows, np.minimum(position, last)]
+        position += (position < s_lengths) & (j < t_lengths) & (t[:, j] == wanted)
+    return position == s_lengths
+
+
+def substring_lengths(a, a_lengths, b, b_lengths):
+    """Longest common substring length of every row pair of two encoded batches.
+
+    A run of matches only grows along the diagonal, so each row is the
+    previous one shifted by a column, plus one where the characters match.
+    """
+    count = len(a)
+    row = np.zeros((count, b.shape[1] + 1), dtype=np.int32)
+    best = np.zeros(count, dtype=np.int32)
+    for i in range(a.shape[1]):
+        char = a[:, i:i + 1]
+        matches = (b == char) & (char != 0)
+        row[:, 1:] = np.where(matches, row[:, :-1] + 1, 0)
+        np.maximum(best, row.max(axis=1), out=best)
+    return best
+
+
+def edit_distances(a, a_lengths, b, b_lengths):
+    """Edit distance of every row pair of two encoded batches.
+
+    ``dp[i][j] = min(dp[i-1][j] + 1, dp[i-1][j-1] + mismatch, dp[i][j-1] + 1)``:
+    the last term is resolved for a whole row at once as a running minimum
+    of ``candidate - j``, the cost-minimizing counterpart of ``lcs_lengths``.
+    Each pair's answer is read from the row of its own length, since padding
+    in ``a`` would count as deletions.
+    """
+    count, width = len(a), b.shape[1]
+    steps = np.arange(width + 1, dtype=np.int32)
+    rows = np.arange(count)
+    row = np.broadcast_to(steps, (count, width + 1)).copy()
+    distances = row[rows, b_lengths]
+    candidates = np.empty((count, width + 1), dtype=np.int32)
+    for i in range(a.shape[1]):
+        mismatches = b != a[:, i:i + 1]
+        candidates[:, 0] = i + 1
+        np.minimum(row[:, 1:] + 1, row[:, :-1] + mismatches, out=candidates[:, 1:])
+        candidates -= steps
+        np.minimum.accumulate(candidates, axis=1, out=row)
+        row += steps
+        done = a_lengths == i + 1
+        distances[done] = row[rows[done], b_lengths[done]]
+    return distances
+
+
+def supersequence_lengths(a, a_lengths, b, b_lengths):
+    """Shortest common supersequence length: every letter of both words, with the LCS shared."""
+    return a_lengths + b_lengths - lcs_lengths(a, a_lengths, b, b_lengths)
+
+
+# Batch solvers for the puzzle modes of ``dp_kernel``
+SOLVERS = {
+    "lcs": lcs_lengths,
+    "substring": substring_lengths,
+    "edit": edit_distances,
+    "supersequence": supersequence_lengths,
+}
+
+
+def similarity(lengths, a_lengths, b_lengths):
+    """``2 * lcs / (len(a) + len(b))``: 1.0 for identical words, 0.0 for nothing in common."""
+    total = a_lengths + b_lengths
+    return np.where(total > 0, 2 * lengths / np.maximum(total, 1), 1.0)
+
+
+def score_pairs(pairs):
+    """LCS lengths and similarity ratios of a list of ``(word1, word2)`` pairs."""
+    require_numpy()
+    if not pairs:
+        return np.zeros(0, dtype=np.int32), np.zeros(0)
+    words1, words2 = zip(*pairs)
+    a, a_lengths = encode(words1)
+    b, b_lengths = encode(words2)
+    lengths = lcs_lengths(a, a_lengths, b, b_lengths)
+    return lengths, similarity(lengths, a_lengths, b_lengths)
+
+
+def solve_pairs(pairs, mode="lcs"):
+    """Answer of one ``dp_kernel`` mode for every ``(word1, word2)`` pair."""
+    require_numpy()
+    if not pairs:
+        return np.zeros(0, dtype=np.int32)
+    words1, words2 = zip(*pairs)
+    a, a_lengths = encode(words1)
+    b, b_lengths = encode(words2)
+    return SOLVERS[mode](a, a_lengths, b, b_lengths)
+
+
+def batch_solve(pairs, mode="lcs", processes=None, chunk_size=CHUNK_SIZE):
+    """``solve_pairs`` for many pairs, split into chunks like ``batch_score``."""
+    require_numpy()
+    chunks = [pairs[start:start + chunk_size] for start in range(0, len(pairs), chunk_size)]
+    if processes == 1 or len(chunks) <= 1:
+        results = [solve_pairs(chunk, mode) for chunk in chunks]
+    else:
+        with Pool(processes) as pool:
+            results = pool.map(functools.partial(solve_pairs, mode=mode), chunks)
+    if not results:
+        return np.zeros(0, dtype=np.int32)
+    return np.concatenate(results)
+
+
+def batch_score(pairs, processes=None, chunk_size=CHUNK_SIZE):
+    """Score many pairs, split into chunks across a process pool when ``processes`` is not 1."""
+    require_numpy()
+    chunks = [pairs[start:start + chunk_size] for start in range(0, len(pairs), chunk_size)]
+    if processes == 1 or len(chunks) <= 1:
+        results = [score_pairs(chunk) for chunk in chunks]
+    else:
+        with Pool(processes) as pool:
+            results = pool.map(score_pairs, chunks)
+    if not results:
+        return np.zeros(0, dtype=np.int32), np.zeros(0)
+    return np.concatenate([lengths for lengths, _ in results]), np.concatenate([ratios for _, ratios in results])
+
+
+def pool_pairs(pool):
+    """Word pairs of every puzzle in a ``PuzzlePool``."""
+    return [(puzzle.word1, puzzle.word2) for puzzle in (pool[position] for position in range(len(pool)))]
+
+
+def stored_mismatches(pool, lengths):
+    """Number of puzzles whose stored LCS length differs from ``lengths``."""
+    stored = np.fromiter((pool[position].lcs_length for position in range(len(pool))), dtype=np.int32, count=len(pool))
+    return int(np.count_nonzero(lengths != stored))
+
+
+def rescore_pool(pool, processes=None):
+    """Recompute the LCS length of every puzzle in a ``PuzzlePool``; returns ``(lengths, ratios, mismatches)``."""
+    lengths, ratios = batch_score(pool_pairs(pool), processes)
+    return lengths, ratios, stored_mismatches(pool, lengths)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Score LCS word pairs in vectorized batches.")
+    parser.add_argument("--pool", help="re-score this puzzle pool (default: the configured pool)")
+    parser.add_argument("--random", type=int, help="score this many random corpus pairs instead")
+    parser.add_argument("--processes", type=int, default=None, help="worker processes (default: CPU count)")
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--mode", choices=SOLVERS, default="lcs",
+                        help="puzzle mode to precompute answers for (default: LCS lengths and similarities)")
+    args = parser.parse_args()
+    if np is None:
+        sys.exit("lcs_batch.py needs NumPy: pip install numpy")
+
+    pool = None
+    if args.random:
+        from corpus import get_word_index
+
+        rng = random.Random(args.seed)
+        index = get_word_index()
+        pairs = [index.random_pair(5, 10, rng) for _ in range(args.random)]
+    else:
+        from puzzles import POOL_PATH, PuzzlePool
+
+        pool = PuzzlePool(args.pool or POOL_PATH)
+        pairs = pool_pairs(pool)
+
+    start = time.time()
+    if args.mode != "lcs":
+        answers = batch_solve(pairs, args.mode, args.processes)
+        if len(answers):
+            print(f"Solved {len(answers)} {args.mode} puzzles in {time.time() - start:.2f}s: "
+                  f"mean answer {answers.mean():.2f}")
+        return
+
+    lengths, ratios = batch_score(pairs, args.processes)
+    if pool is not None:
+        print(f"{stored_mismatches(pool, lengths)} stored LCS lengths differ from the recomputed ones")
+    elapsed = time.time() - start
+    if len(lengths):
+        print(f"Scored {len(lengths)} pairs in {elapsed:.2f}s: mean LCS {lengths.mean():.2f}, "
+              f"mean similarity {ratios.mean():.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,556 @@
+import os
+
+from dp_kernel import lcs_table
+
+# Inputs with at most this many DP cells are solved with a full table, larger ones with Hirschberg
+FULL_TABLE_CELLS = 4096
+
+
+def is_subsequence(s, t):
+    """Return True if ``s`` can be obtained from ``t`` by deleting characters."""
+    remaining = iter(t)
+    return all(char in remaining for char in s)
+
+
+def match_masks(b):
+    """Map every character of ``b`` to a bitmask of the positions where it occurs."""
+    masks = {}
+    for j, char in enumerate(b):
+        masks[char] = masks.get(char, 0) | (1 << j)
+    return masks
+
+
+class PythonBackend:
+    """Bit-parallel LCS (Allison-Dix / Hyyro) on Python integers.
+
+    Bit ``j`` of the state vector ``V`` is cleared exactly where the DP row
+    steps up, so ``LCS(a, b[:j])`` is the number of zero bits below ``j``.
+    Each character of ``a`` costs a handful of big-integer operations.
+    """
+
+    name = "python"
+
+    def _state(self, a, b):
+        mask = (1 << len(b)) - 1
+        masks = match_masks(b)
+        v = mask
+        for char in a:
+            u = v & masks.get(char, 0)
+            v = ((v + u) | (v - u)) & mask
+        return v
+
+    def lcs_length(self, a, b):
+        if not a or not b:
+            return 0
+        return len(b) - bin(self._state(a, b)).count("1")
+
+    def lcs_row(self, a, b):
+        """Return ``[LCS(a, b[:j]) for j in range(len(b) + 1)]``."""
+        row = [0] * (len(b) + 1)
+        if not a or not b:
+            return row
+        bits = bin(self._state(a, b))[2:].zfill(len(b))
+        length = 0
+        for j, bit in enumerate(reversed(bits), 1):
+            if bit == "0":
+                length += 1
+            row[j] = length
+        return row
+
+
+class NumpyBackend:
+    """Row-at-a-time DP vectorized with NumPy.
+
+    ``dp[i][j] = max(dp[i][j-1], dp[i-1][j], dp[i-1][j-1] + match)`` unrolls
+    into a running maximum along the row, so each row is three array ops.
+    """
+
+    name = "numpy"
+
+    def __init__(self):
+        import numpy
+
+        self.np = numpy
+
+    def _codes(self, text):
+        return self.np.frombuffer(text.encode("utf-32-le"), dtype=self.np.uint32)
+
+    def lcs_row(self, a, b):
+        np = self.np
+        row = np.zeros(len(b) + 1, dtype=np.int32)
+        if not a or not b:
+            return row.tolist()
+        codes_b = self._codes(b)
+        candidates = np.empty(len(b), dtype=np.int32)
+        for code in self._codes(a):
+            np.add(row[:-1], codes_b == code, out=candidates)
+            np.maximum(candidates, row[1:], out=candidates)
+            np.maximum.accumulate(candidates, out=row[1:])
+        return row.tolist()
+
+    def lcs_length(self, a, b):
+        if not a or not b:
+            return 0
+        return self.lcs_row(a, b)[-1]
+
+
+BACKENDS = {
+    "python": PythonBackend,
+    "numpy": NumpyBackend,
+}
+
+_backend = None
+
+
+def set_backend(name):
+    """Select the LCS backend by name ("python" or "numpy")."""
+    global _backend
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown LCS backend: {name}")
+    _backend = BACKENDS[name]()
+    return _backend
+
+
+def get_backend():
+    """Return the active backend, defaulting to ``LCS_BACKEND`` or pure Python."""
+    if _backend is None:
+        return set_backend(os.environ.get("LCS_BACKEND", "python"))
+    return _backend
+
+
+def lcs_length(a, b):
+    """Exact length of the longest common subsequence of ``a`` and ``b``."""
+    return get_backend().lcs_length(a, b)
+
+
+def lcs_matrix(a, b):
+    """Full ``(len(a) + 1) x (len(b) + 1)`` DP table of prefix LCS lengths."""
+    return lcs_table(a, b)
+
+
+def traceback(a, b, matrix):
+    """Recover one LCS string from a table built by ``lcs_matrix``."""
+    i, j = len(a), len(b)
+    lcs = []
+    while i > 0 and j > 0:
+        if a[i - 1] == b[j - 1]:
+            lcs.append(a[i - 1])
+            i -= 1
+            j -= 1
+        elif matrix[i - 1][j] > matrix[i][j - 1]:
+            i -= 1
+        else:
+            j -= 1
+    return "".join(reversed(lcs))
+
+
+def lcs_matrix_steps(a, b):
+    """Fill the ``lcs_matrix`` table one cell at a time, yielding ``(i, j, matrix)`` after each cell.
+
+    Lets the tutorial animate the computation, or spread a large table over
+    many frames, without holding up the caller.
+    """
+    m, n = len(a), len(b)
+    dp = [[0] * (n + 1) for _ in range(m + 1)]
+    for i in range(1, m + 1):
+        previous, current = dp[i - 1], dp[i]
+        char = a[i - 1]
+        for j in range(1, n + 1):
+            if char == b[j - 1]:
+                current[j] = previous[j - 1] + 1
+            else:
+                current[j] = max(previous[j], current[j - 1])
+            yield i, j, dp
+
+
+def traceback_path(a, b, matrix):
+    """Cells visited by ``traceback`` from the bottom-right corner, as ``(i, j, matched)`` tuples."""
+    i, j = len(a), len(b)
+    path = []
+    while i > 0 and j > 0:
+        if a[i - 1] == b[j - 1]:
+            path.append((i, j, True))
+            i -= 1
+            j -= 1
+        else:
+            path.append((i, j, False))
+            if matrix[i - 1][j] > matrix[i][j - 1]:
+                i -= 1
+            else:
+                j -= 1
+    return path
+
+
+def _hirschberg(a, b, backend):
+    if not a or not b:
+        return ""
+    if len(a) == 1:
+        return a if a in b else ""
+    if len(a) * len(b) <= FULL_TABLE_CELLS:
+        return traceback(a, b, lcs_matrix(a, b))
+
+    # Split ``a`` in half and find where the optimal path crosses the middle row
+    mid = len(a) // 2
+    forward = backend.lcs_row(a[:mid], b)
+    backward = backend.lcs_row(a[mid:][::-1], b[::-1])
+    n = len(b)
+    split = max(range(n + 1), key=lambda j: forward[j] + backward[n - j])
+    return _hirschberg(a[:mid], b[:split], backend) + _hirschberg(a[mid:], b[split:], backend)
+
+
+def lcs(a, b):
+    """Return one longest common subsequence of ``a`` and ``b``.
+
+    Short inputs use a full DP table; long ones use Hirschberg's divide and
+    conquer, which needs only linear space.
+    """
+    return _hirschberg(a, b, get_backend())
+
+
+def suffix_lcs_matrix(a, b):
+    """Table where ``dp[i][j]`` is the LCS length of the suffixes ``a[i:]`` and ``b[j:]``."""
+    m, n = len(a), len(b)
+    dp = [[0] * (n + 1) for _ in range(m + 1)]
+    for i in range(m - 1, -1, -1):
+        following, current = dp[i + 1], dp[i]
+        char = a[i]
+        for j in range(n - 1, -1, -1):
+            if char == b[j]:
+                current[j] = following[j + 1] + 1
+            else:
+                current[j] = max(following[j], current[j + 1])
+    return dp
+
+
+def next_occurrence(text):
+    """List where entry ``i`` maps each character to its first index ``>= i`` in ``text``."""
+    table = [None] * (len(text) + 1)
+    table[len(text)] = {}
+    for i in range(len(text) - 1, -1, -1):
+        table[i] = dict(table[i + 1])
+        table[i][text[i]] = i
+    return table
+
+
+def count_lcs(a, b):
+    """Number of distinct strings that are a longest common subsequence of ``a`` and ``b``."""
+    return LCSSolutions(a, b).count()
+
+
+class LCSSolutions:
+    """Every longest common subsequence of two words, as a DAG over the suffix DP table.
+
+    A node ``(i, j)`` stands for the suffixes ``a[i:]`` and ``b[j:]``. An edge
+    labelled ``c`` matches ``c`` at its earliest position in both suffixes and
+    only exists if the rest can still be completed optimally, so each distinct
+    answer is exactly one path from ``(0, 0)``. Counting, membership tests and
+    enumeration walk this graph without ever building the (possibly
+    exponential) set of strings. Nodes are expanded lazily and cached.
+    """
+
+    def __init__(self, a, b):
+        self.a, self.b = a, b
+        self.dp = suffix_lcs_matrix(a, b)
+        self.next_a, self.next_b = next_occurrence(a), next_occurrence(b)
+        self.common = sorted(set(a) & set(b))
+        self._edges = {}
+        self._count = None
+
+    @property
+    def length(self):
+        return self.dp[0][0]
+
+    def edges(self, node):
+        """``(char, next_node)`` pairs leaving ``node``, in alphabetical order."""
+        edges = self._edges.get(node)
+        if edges is None:
+            i, j = node
+            length = self.dp[i][j]
+            edges = []
+            if length:
+                next_a, next_b = self.next_a[i], self.next_b[j]
+                for char in self.common:
+                    i2, j2 = next_a.get(char), next_b.get(char)
+                    if i2 is not None and j2 is not None and self.dp[i2 + 1][j2 + 1] == length - 1:
+                        edges.append((char, (i2 + 1, j2 + 1)))
+            self._edges[node] = edges
+        return edges
+
+    def count(self):
+        """Number of distinct optimal answers."""
+        if self._count is None:
+            # Collect the reachable nodes level by level, then add up paths from the last level back
+            levels = [[(0, 0)]]
+            for _ in range(self.length):
+                children = {}
+                for node in levels[-1]:
+                    for _, child in self.edges(node):
+                        children[child] = None
+                levels.append(list(children))
+            counts = dict.fromkeys(levels[-1], 1)
+            for level in reversed(levels[:-1]):
+                for node in level:
+                    counts[node] = sum(counts[child] for _, child in self.edges(node))
+            self._count = counts[(0, 0)]
+        return self._count
+
+    def path(self, sequence):
+        """Nodes visited while matching ``sequence`` as an optimal prefix, or None if it is not one."""
+        node = (0, 0)
+        nodes = [node]
+        for char in sequence:
+            i, j = node
+            i2, j2 = self.next_a[i].get(char), self.next_b[j].get(char)
+            if i2 is None or j2 is None or self.dp[i2 + 1][j2 + 1] != self.dp[i][j] - 1:
+                return None
+            node = (i2 + 1, j2 + 1)
+            nodes.append(node)
+        return nodes
+
+    def __contains__(self, sequence):
+        return len(sequence) == self.length and self.path(sequence) is not None
+
+    def matched_indices(self, sequence):
+        """Positions of an optimal answer's letters in the first and second word, or None."""
+        nodes = self.path(sequence)
+        if nodes is None:
+            return None
+        return [i - 1 for i, _ in nodes[1:]], [j - 1 for _, j in nodes[1:]]
+
+    def __iter__(self):
+        """Yield the optimal answers in alphabetical order, one at a time."""
+        if not self.length:
+            yield ""
+            return
+        prefix = []
+        stack = [iter(self.edges((0, 0)))]
+        while stack:
+            for char, child in stack[-1]:
+                prefix.append(char)
+                if len(prefix) == self.length:
+                    yield "".join(prefix)
+                    prefix.pop()
+                else:
+                    stack.append(iter(self.edges(child)))
+                break
+            else:
+                stack.pop()
+                if prefix:
+                    prefix.pop()
+
+
+class IncrementalMatcher:
+    """Checks a sequence typed one character at a time against two words.
+
+    Every typed character is matched at its earliest position in both words
+    (which leaves the longest possible suffixes), so ``push`` and ``pop`` are
+    O(1) lookups in the precomputed next-occurrence tables. Once a character
+    fits nowhere the sequence stays invalid until it is deleted again.
+    """
+
+    def __init__(self, a, b, solutions=None):
+        # Share the tables of an ``LCSSolutions`` for the same words if one exists
+        solutions = solutions or LCSSolutions(a, b)
+        self.next_a, self.next_b = solutions.next_a, solutions.next_b
+        self.dp = solutions.dp
+        self.reset()
+
+    def reset(self):
+        self.positions = [(0, 0)]
+        self.invalid = 0
+
+    def push(self, char):
+        """Add ``char``; returns False if the sequence is no longer common to both words."""
+        if not self.invalid:
+            i, j = self.positions[-1]
+            i2, j2 = self.next_a[i].get(char), self.next_b[j].get(char)
+            if i2 is not None and j2 is not None:
+                self.positions.append((i2 + 1, j2 + 1))
+                return True
+        self.invalid += 1
+        return False
+
+    def pop(self):
+        """Remove the last character."""
+        if self.invalid:
+            self.invalid -= 1
+        elif len(self.positions) > 1:
+            self.positions.pop()
+
+    @property
+    def valid(self):
+        return not self.invalid
+
+    @property
+    def lcs_length(self):
+        return self.dp[0][0]
+
+    @property
+    def matched(self):
+        """Number of characters of the valid prefix (the whole sequence when valid)."""
+        return len(self.positions) - 1
+
+    @property
+    def remaining(self):
+        """How many more characters can still be added; 0 when the sequence is invalid."""
+        if self.invalid:
+            return 0
+        i, j = self.positions[-1]
+        return self.dp[i][j]
+
+    @property
+    def matched_indices(self):
+        """Positions of the matched characters in the first and second word."""
+        return [i - 1 for i, _ in self.positions[1:]], [j - 1 for _, j in self.positions[1:]]
+
+
+def is_common_subsequence(sequence, words):
+    """Return True if ``sequence`` is a subsequence of every word in ``words``."""
+    return all(is_subsequence(sequence, word) for word in words)
+
+
+class MultiLCS:
+    """Longest common subsequences of any number of words.
+
+    A state is a tuple with one position per word. Matching a character at
+    its earliest position in every word leads to the next state, and only
+    dominant states are kept: a successor that is behind another one in
+    every word can never do better, so it is dropped. Successors are
+    explored best bound first, where the bound is the smallest pairwise
+    suffix LCS of the state, and the search stops as soon as no remaining
+    successor can beat the best one found. Results are memoized per state,
+    so the work grows with the number of dominant states instead of with
+    the product of the word lengths like the k-dimensional DP table.
+    """
+
+    def __init__(self, words):
+        if len(words) < 2:
+            raise ValueError("MultiLCS needs at least two words")
+        self.words = tuple(words)
+        self.nexts = [next_occurrence(word) for word in self.words]
+        self.pairs = [(i, j, suffix_lcs_matrix(self.words[i], self.words[j]))
+                      for i in range(len(self.words)) for j in range(i + 1, len(self.words))]
+        self.common = sorted(set.intersection(*map(set, self.words)))
+        self.start = (0,) * len(self.words)
+        self._memo = {}
+
+    def bound(self, state):
+        """Upper bound on the LCS length of the suffixes at ``state``."""
+        return min(dp[state[i]][state[j]] for i, j, dp in self.pairs)
+
+    def successors(self, state):
+        """Dominant states reachable by matching one more character, as ``(char, state)``."""
+        found = []
+        for char in self.common:
+            positions = []
+            for table, position in zip(self.nexts, state):
+                position = table[position].get(char)
+                if position is None:
+                    break
+                positions.append(position + 1)
+            else:
+                found.append((char, tuple(positions)))
+        return [(char, state) for char, state in found
+                if not any(other != state and all(o <= s for o, s in zip(other, state)) for _, other in found)]
+
+    def length_from(self, state):
+        """LCS length of the suffixes of every word starting at ``state``."""
+        cached = self._memo.get(state)
+        if cached is not None:
+            return cached[0]
+        children = sorted(((self.bound(child), char, child) for char, child in self.successors(state)), reverse=True)
+        best, choice = 0, None
+        for bound, char, child in children:
+            if bound + 1 <= best:
+                break  # sorted by bound, so no later successor can do better either
+            length = self.length_from(child) + 1
+            if length > best:
+                best, choice = length, (char, child)
+        self._memo[state] = (best, choice)
+        return best
+
+    @property
+    def length(self):
+        return self.length_from(self.start)
+
+    def solution(self):
+        """One longest common subsequence of all the words."""
+        self.length_from(self.start)
+        chars, state = [], self.start
+        while self._memo[state][1] is not None:
+            char, state = self._memo[state][1]
+            chars.append(char)
+        return "".join(chars)
+
+    def __contains__(self, sequence):
+        return len(sequence) == self.length and is_common_subsequence(sequence, self.words)
+
+    def matched_indices(self, sequence):
+        """Earliest positions of ``sequence``'s characters in each word."""
+        indices = []
+        for word in self.words:
+            positions, start = [], 0
+            for char in sequence:
+                start = word.index(char, start) + 1
+                positions.append(start - 1)
+            indices.append(positions)
+        return indices
+
+
+class MultiMatcher:
+    """``IncrementalMatcher`` for any number of words, backed by a ``MultiLCS``."""
+
+    def __init__(self, solutions):
+        self.nexts = solutions.nexts
+        self.solutions = solutions
+        self.reset()
+
+    def reset(self):
+        self.positions = [self.solutions.start]
+        self.invalid = 0
+
+    def push(self, char):
+        """Add ``char``; returns False if the sequence is no longer common to every word."""
+        if not self.invalid:
+            state = []
+            for table, position in zip(self.nexts, self.positions[-1]):
+                position = table[position].get(char)
+                if position is None:
+                    break
+                state.append(position + 1)
+            else:
+                self.positions.append(tuple(state))
+                return True
+        self.invalid += 1
+        return False
+
+    def pop(self):
+        """Remove the last character."""
+        if self.invalid:
+            self.invalid -= 1
+        elif len(self.positions) > 1:
+            self.positions.pop()
+
+    @property
+    def valid(self):
+        return not self.invalid
+
+    @property
+    def lcs_length(self):
+        return self.solutions.length
+
+    @property
+    def matched(self):
+        return len(self.positions) - 1
+
+    @property
+    def remaining(self):
+        """How many more characters can still be added; 0 when the sequence is invalid."""
+        if self.invalid:
+            return 0
+        return self.solutions.length_from(self.positions[-1])
+
+    @property
+    def matched_indices(self):
+        """Positions of the matched characters in each word."""
+        return [[state[k] - 1 for state in self.positions[1:]] for k in range(len(self.nexts))]
@@ -0,0 +1,310 @@
+import argparse
+import atexit
+import bisect
+import datetime
+import os
+import sqlite3
+import time
+from collections import Counter
+
+from profiler import profiler
+from scores import FLUSH_DELAY, ScoreStore
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))  # Get the absolute path of the script's directory
+
+LEADERBOARD_DB = os.environ.get("LCS_LEADERBOARD_DB", os.path.join(BASE_DIR, "assets", "leaderboard.db"))
+
+PERIODS = ("all", "week", "day")
+
+# SQLite page cache used while merging runs from other kiosks
+IMPORT_CACHE_KB = 256 * 1024
+
+SCHEMA = [
+    "CREATE TABLE IF NOT EXISTS runs ("
+    # Anonymous runs have an empty name, since NULLs never collide in the unique index below
+    "id INTEGER PRIMARY KEY, player TEXT NOT NULL DEFAULT '', score INTEGER NOT NULL, level INTEGER NOT NULL, "
+    "duration REAL NOT NULL, finished_at REAL NOT NULL, day INTEGER NOT NULL, week INTEGER NOT NULL)",
+    # One index per board, so a top-K query reads K entries of an index instead of sorting the table
+    "CREATE INDEX IF NOT EXISTS runs_score ON runs (score DESC, id)",
+    "CREATE INDEX IF NOT EXISTS runs_day ON runs (day, score DESC, id)",
+    "CREATE INDEX IF NOT EXISTS runs_week ON runs (week, score DESC, id)",
+    # A player's best run of a period is the first entry of one of these
+    "CREATE INDEX IF NOT EXISTS runs_player ON runs (player, score DESC)",
+    "CREATE INDEX IF NOT EXISTS runs_player_day ON runs (player, day, score DESC)",
+    "CREATE INDEX IF NOT EXISTS runs_player_week ON runs (player, week, score DESC)",
+    # Identifies a run, so importing the same kiosk database twice adds nothing
+    "CREATE UNIQUE INDEX IF NOT EXISTS runs_unique ON runs (finished_at, player, score)",
+    # How many runs of each period reached each score, kept up to date on every insert
+    "CREATE TABLE IF NOT EXISTS score_counts ("
+    "period TEXT NOT NULL, score INTEGER NOT NULL, count INTEGER NOT NULL, PRIMARY KEY (period, score))",
+]
+
+
+def day_number(timestamp):
+    return datetime.date.fromtimestamp(timestamp).toordinal()
+
+
+def week_number(timestamp):
+    """Day number of the Monday that starts the timestamp's week."""
+    day = day_number(timestamp)
+    return day - datetime.date.fromordinal(day).weekday()
+
+
+def period_keys(day, week):
+    return ("all", f"day:{day}", f"week:{week}")
+
+
+class ScoreIndex:
+    """Fenwick tree counting runs per score, for rank queries in O(log n).
+
+    Scores are compressed to the sorted distinct values seen so far. A new
+    distinct score rebuilds the tree, which is rare once the common scores
+    have all appeared.
+    """
+
+    def __init__(self, counts=()):
+        self.counts = dict(counts)
+        self.build()
+
+    def build(self):
+        self.scores = sorted(self.counts)
+        self.tree = [0] * (len(self.scores) + 1)
+        self.total = 0
+        for position, score in enumerate(self.scores, 1):
+            self.add_at(position, self.counts[score])
+
+    def add_at(self, position, count):
+        self.total += count
+        while position < len(self.tree):
+            self.tree[position] += count
+            position += position & -position
+
+    def add(self, score, count=1):
+        if score not in self.counts:
+            self.counts[score] = count
+            self.build()
+            return
+        self.counts[score] += count
+        self.add_at(bisect.bisect_left(self.scores, score) + 1, count)
+
+    def at_most_position(self, position):
+        count = 0
+        while position > 0:
+            count += self.tree[position]
+            position -= position & -position
+        return count
+
+    def above(self, score):
+        """Number of runs that scored more than ``score``."""
+        return self.total - self.at_most_position(bisect.bisect_right(self.scores, score))
+
+    def rank(self, score):
+        """Board position a run with ``score`` has (ties share the better position)."""
+        return self.above(score) + 1
+
+
+class Leaderboard(ScoreStore):
+    """Every finished run in SQLite, with all-time, weekly and daily boards.
+
+    Top-K boards read the first K entries of an index on the period and
+    score. Ranks come from an in-memory ``ScoreIndex`` per period, loaded
+    from the ``score_counts`` table, which every insert updates, so neither
+    ever scans the runs. New runs count towards ranks at once and are
+    written in one transaction by the score store's debounced flush.
+    """
+
+    def __init__(self, path=LEADERBOARD_DB, flush_delay=FLUSH_DELAY):
+        self.pending_runs = []
+        self.indexes = {}
+        super().__init__(path, flush_delay)
+
+    def load(self):
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        self.connection = sqlite3.connect(self.path, check_same_thread=False)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("PRAGMA synchronous=NORMAL")
+        with self.connection:
+            for statement in SCHEMA:
+                self.connection.execute(statement)
+        return {}
+
+    def period_key(self, period, now=None):
+        if period == "all":
+            return "all", None
+        now = time.time() if now is None else now
+        if period == "day":
+            return f"day:{day_number(now)}", ("day", day_number(now))
+        if period == "week":
+            return f"week:{week_number(now)}", ("week", week_number(now))
+        raise ValueError(f"Unknown leaderboard period: {period}")
+
+    def index(self, key):
+        """The rank index of one period, loaded on first use."""
+        with self.lock:
+            if key not in self.indexes:
+                counts = self.connection.execute(
+                    "SELECT score, count FROM score_counts WHERE period = ?", (key,)
+                ).fetchall()
+                self.indexes[key] = ScoreIndex(counts)
+                for run in self.pending_runs:
+                    if key in period_keys(run[-2], run[-1]):
+                        self.indexes[key].add(run[1])
+            return self.indexes[key]
+
+    def record_run(self, player, score, level, duration, finished_at=None):
+        """Add a finished run; it is ranked immediately and saved shortly after."""
+        finished_at = time.time() if finished_at is None else finished_at
+        day, week = day_number(finished_at), week_number(finished_at)
+        with self.lock:
+            self.pending_runs.append((player, score, level, duration, finished_at, day, week))
+            self.dirty = True
+            for key in period_keys(day, week):
+                if key in self.indexes:
+                    self.indexes[key].add(score)
+        self.schedule_flush()
+
+    def flush(self):
+        """Write pending runs now."""
+        # Runs are inserted under the lock, so a rank index loaded meanwhile sees them either pending or stored
+        with self.write_lock, self.lock:
+            self.timer = None
+            runs, self.pending_runs = self.pending_runs, []
+            self.dirty = False
+            if runs:
+                with profiler.section("io"):
+                    self.insert(runs)
+
+    def insert(self, runs):
+        """Insert runs and their score counts in one transaction; returns the runs that were new."""
+        with self.connection:
+            last_id = self.connection.execute("SELECT COALESCE(MAX(id), 0) FROM runs").fetchone()[0]
+            self.connection.executemany(
+                "INSERT OR IGNORE INTO runs (player, score, level, duration, finished_at, day, week) "
+                "VALUES (COALESCE(?, ''), ?, ?, ?, ?, ?, ?)", runs
+            )
+            added = self.connection.execute(
+                "SELECT score, day, week FROM runs WHERE id > ?", (last_id,)
+            ).fetchall()
+            counts = Counter((key, score) for score, day, week in added for key in period_keys(day, week))
+            self.connection.executemany(
+                "INSERT INTO score_counts (period, score, count) VALUES (?, ?, ?) "
+                "ON CONFLICT (period, score) DO UPDATE SET count = count + excluded.count",
+                [(key, score, count) for (key, score), count in counts.items()]
+            )
+        return added
+
+    def import_runs(self, runs):
+        """Merge runs from other kiosks, as ``(player, score, level, duration, finished_at)`` tuples."""
+        self.flush()
+        rows = sorted((player or "", score, level, duration, finished_at, day_number(finished_at),
+                       week_number(finished_at)) for player, score, level, duration, finished_at in runs)
+        with self.lock:
+            # A bigger page cache keeps the score indexes in memory while millions of rows go in
+            self.connection.execute(f"PRAGMA cache_size = -{IMPORT_CACHE_KB}")
+            try:
+                added = self.insert(rows)
+            finally:
+                self.connection.execute("PRAGMA cache_size = -2000")
+            for score, day, week in added:
+                for key in period_keys(day, week):
+                    if key in self.indexes:
+                        self.indexes[key].add(score)
+        return len(added)
+
+    def top(self, count=10, period="all"):
+        """Best runs of a period as ``(player, score, level, finished_at)`` tuples."""
+        self.flush()
+        _, where = self.period_key(period)
+        with self.lock:
+            if where is None:
+                return self.connection.execute(
+                    "SELECT player, score, level, finished_at FROM runs ORDER BY score DESC, id LIMIT ?", (count,)
+                ).fetchall()
+            column, value = where
+            return self.connection.execute(
+                f"SELECT player, score, level, finished_at FROM runs WHERE {column} = ? "
+                "ORDER BY score DESC, id LIMIT ?", (value, count)
+            ).fetchall()
+
+    def rank(self, score, period="all"):
+        """Position a run with ``score`` has on the period's board."""
+        return self.index(self.period_key(period)[0]).rank(score)
+
+    def size(self, period="all"):
+        return self.index(self.period_key(period)[0]).total
+
+    def best(self, player, period="all"):
+        """The player's best score in the period, or None if they have no runs in it."""
+        self.flush()
+        _, where = self.period_key(period)
+        with self.lock:
+            if where is None:
+                row = self.connection.execute(
+                    "SELECT score FROM runs WHERE player = ? ORDER BY score DESC LIMIT 1", (player,)
+                ).fetchone()
+            else:
+                column, value = where
+                row = self.connection.execute(
+                    f"SELECT score FROM runs WHERE player = ? AND {column} = ? ORDER BY score DESC LIMIT 1",
+                    (player, value)
+                ).fetchone()
+        return row[0] if row else None
+
+    def player_rank(self, player, period="all"):
+        """Board position of the player's best run in the period, or None."""
+        best = self.best(player, period)
+        return None if best is None else self.rank(best, period)
+
+    def close(self):
+        super().close()
+        self.connection.close()
+
+
+_leaderboard = None
+
+
+def get_leaderboard():
+    """Return the shared leaderboard."""
+    global _leaderboard
+    if _leaderboard is None:
+        _leaderboard = Leaderboard()
+        atexit.register(_leaderboard.close)
+    return _leaderboard
+
+
+def read_runs(path):
+    """Runs stored in another leaderboard database."""
+    connection = sqlite3.connect(path)
+    try:
+        return connection.execute("SELECT player, score, level, duration, finished_at FROM runs").fetchall()
+    finally:
+        connection.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Show the leaderboard or merge runs from other kiosks.")
+    parser.add_argument("--import", dest="imports", nargs="+", default=[],
+                        help="leaderboard.db files to merge")
+    parser.add_argument("--period", choices=PERIODS, default="all")
+    parser.add_argument("--top", type=int, default=10)
+    parser.add_argument("--player", help="also show this player's best run and rank")
+    args = parser.parse_args()
+
+    board = get_leaderboard()
+    for path in args.imports:
+        start = time.time()
+        added = board.import_runs(read_runs(path))
+        print(f"Imported {added} new runs from {path} in {time.time() - start:.2f}s")
+    print(f"{args.period} board, {board.size(args.period)} runs")
+    for place, (player, score, level, finished_at) in enumerate(board.top(args.top, args.period), 1):
+        print(f"{place:>4}. {player or '-':<16} {score:>8}  level {level}")
+    if args.player:
+        rank = board.player_rank(args.player, args.period)
+        if rank is None:
+            print(f"{args.player} has no runs in this period")
+        else:
+            print(f"{args.player}: best {board.best(args.player, args.period)}, rank {rank}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,35 +1,78 @@
+from app import get_app, get_screen, STARTUP_REPORT  # first, so startup timing covers every import
 import asyncio
 import pygame
-import os
-from menu import init_menu
-from lcs import LCSGame
-from tutorial import Tutorial
+import sys
+from menu import Menu, init_menu_async
+from assets import load_image, LOGO_PATH
+from scores import get_score_store
 
-BASE_DIR = os.path.dirname(os.path.abspath(__file__)) 
+def start_background_work():
+    """Start the audio and load the word corpus off the event loop while the menu is running."""
+    from audio import get_audio
+    from corpus import get_word_index
 
-LOGO_PATH = os.path.join(BASE_DIR, "assets", "logo.png")
+    get_audio()  # start decoding sound effects while the menu is up
+    get_app().mark("audio started")
+    if sys.platform == "emscripten":  # no threads in the browser build; load on first game instead
+        return None
+    return asyncio.get_running_loop().run_in_executor(None, get_word_index)
 
 async def main():
     """Main function to run the game."""
+    app = get_app()
+    app.mark("menu imported")
+    get_screen()
+    pygame.display.set_icon(load_image(LOGO_PATH, alpha=True))
+    menu = Menu()
+    background = []
+
+    def on_first_frame():
+        app.mark("first menu frame")
+        background.append(start_background_work())
+        if STARTUP_REPORT:
+            app.report()
+
     while True:
-        action = init_menu()
-        
-        # Set the window icon
-        icon = pygame.image.load(LOGO_PATH)  # Replace with your icon file path
-        pygame.display.set_icon(icon)
-        
+        action = await init_menu_async(menu, on_first_frame if not background else None)
+
         await asyncio.sleep(0)
         if action == "start":
-            game = LCSGame()
-            result = game.run()
+            from lcs import LCSGame
+            from replay import start_recording
+
+            if background[0] is not None:
+                await background[0]
+            game = LCSGame(recorder=start_recording())
+            result = await game.run_async()
             if result == "exit_to_menu":
                 continue
+        elif action == "race":
+            from race import run_race
+
+            if background[0] is not None:
+                await background[0]
+            await run_race()
+        elif action == "multi":
+            from multi_lcs import MultiLCSGame
+
+            if background[0] is not None:
+                await background[0]
+            await MultiLCSGame().run_async()
+        elif action == "puzzles":
+            from puzzle_modes import PuzzleModesGame
+
+            if background[0] is not None:
+                await background[0]
+            await PuzzleModesGame().run_async()
         elif action == "tutorial":
+            from tutorial import Tutorial
+
             tutorial = Tutorial()
-            tutorial.show()
+            await tutorial.show_async()
         else:
+            get_score_store().close()
             pygame.quit()
             break
 
 if __name__ == "__main__":
-    asyncio.run(main())
\ No newline at end of file
+    asyncio.run(main())
@@ -0,0 +1,178 @@
+import pygame
+from settings import WHITE, BLACK, GREEN, DARK_GREEN, DARK_GRAY, GRAY, YELLOW
+from lcs_engine import lcs_matrix_steps, traceback_path
+from text_cache import render_text
+
+# Largest cell, and the smallest one that still gets digits and letters drawn in it
+MAX_CELL = 40
+MIN_TEXT_CELL = 14
+
+# Slowest fill speed, and the longest a fill or traceback may take however big the table is
+FRAMES_PER_CELL = 6
+MAX_ANIMATION_FRAMES = 360
+
+
+def _shade(value, top):
+    """Cell color from dark gray (0) to dark green (the LCS length)."""
+    t = value / top if top else 0
+    return tuple(int(low + (high - low) * t) for low, high in zip(DARK_GRAY, DARK_GREEN))
+
+
+class MatrixView:
+    """The LCS table of two words, filled one cell per tick and then traced back.
+
+    The table lives on a persistent surface: each tick paints only the cells
+    that changed and returns their rectangles, so the renderer pushes just
+    those to the display. Large tables advance several cells per frame so an
+    animation never takes longer than ``MAX_ANIMATION_FRAMES``. Pass the
+    memoized ``(matrix, path)`` of an example solved before to replay it
+    without recomputing, and ``animate=False`` to show it finished at once.
+    """
+
+    def __init__(self, seq1, seq2, size, solved=None, animate=True):
+        self.seq1, self.seq2 = seq1, seq2
+        m, n = len(seq1), len(seq2)
+        width, height = size
+        self.cell = max(1, min(MAX_CELL, width // (n + 2), height // (m + 2)))
+        self.show_text = self.cell >= MIN_TEXT_CELL
+        self.font_size = max(8, int(self.cell * 0.6))
+        # Center the table, leaving one column and one row for the letters
+        self.origin = ((width - self.cell * (n + 2)) // 2 + self.cell, (height - self.cell * (m + 2)) // 2 + self.cell)
+        self.surface = pygame.Surface(size)
+        self.top = max(1, min(m, n))
+        self.dirty = []
+        self.solved = solved
+        self.start(animate)
+
+    def start(self, animate=True):
+        """Draw the empty table and start (or restart) the animation."""
+        self.surface.fill(GRAY)
+        self.dirty = [self.surface.get_rect()]
+        self.draw_labels()
+        for i in range(len(self.seq1) + 1):
+            self.draw_cell(i, 0, 0)
+        for j in range(len(self.seq2) + 1):
+            self.draw_cell(0, j, 0)
+        cells = len(self.seq1) * len(self.seq2)
+        self.speed = max(1 / FRAMES_PER_CELL, cells / MAX_ANIMATION_FRAMES)
+        self.progress = 0.0
+        self.current = None
+        self.path = []
+        self.path_shown = 0
+        self.lcs = ""
+        if self.solved is not None:
+            self.matrix, self.path = self.solved
+            self.steps = self.reveal()
+        else:
+            self.matrix = None
+            self.steps = lcs_matrix_steps(self.seq1, self.seq2)
+        self.phase = "fill" if cells else "done"
+        if not animate:
+            self.finish()
+
+    def reveal(self):
+        """Walk the cells of an already solved table in the order they are computed."""
+        for i in range(1, len(self.seq1) + 1):
+            for j in range(1, len(self.seq2) + 1):
+                yield i, j, self.matrix
+
+    def cell_rect(self, i, j):
+        x, y = self.origin
+        return pygame.Rect(x + j * self.cell, y + i * self.cell, self.cell, self.cell)
+
+    def draw_labels(self):
+        if not self.show_text:
+            return
+        for j, char in enumerate(self.seq2, 1):
+            text = render_text(char, WHITE, self.font_size, None)
+            self.surface.blit(text, text.get_rect(center=self.cell_rect(-1, j).center))
+        for i, char in enumerate(self.seq1, 1):
+            text = render_text(char, WHITE, self.font_size, None)
+            self.surface.blit(text, text.get_rect(center=self.cell_rect(i, -1).center))
+
+    def draw_cell(self, i, j, value, highlight=None):
+        rect = self.cell_rect(i, j)
+        self.surface.fill(highlight or _shade(value, self.top), rect)
+        if self.cell > 3:
+            pygame.draw.rect(self.surface, BLACK, rect, 1)
+        if self.show_text:
+            text = render_text(str(value), BLACK if highlight else WHITE, self.font_size, None)
+            self.surface.blit(text, text.get_rect(center=rect.center))
+        self.dirty.append(rect)
+
+    def fill_cells(self, count):
+        for _ in range(count):
+            step = next(self.steps, None)
+            if step is None:
+                self.end_fill()
+                return
+            if self.current is not None:
+                self.draw_cell(*self.current)
+            i, j, self.matrix = step
+            self.current = (i, j, self.matrix[i][j])
+            self.draw_cell(*self.current, highlight=YELLOW)
+
+    def end_fill(self):
+        if self.current is not None:
+            self.draw_cell(*self.current)
+            self.current = None
+        if self.solved is None:
+            self.path = traceback_path(self.seq1, self.seq2, self.matrix)
+            self.solved = (self.matrix, self.path)
+        self.path_speed = max(1 / FRAMES_PER_CELL, len(self.path) / MAX_ANIMATION_FRAMES)
+        self.progress = 0.0
+        self.phase = "traceback" if self.path else "done"
+
+    def trace_cells(self, count):
+        for _ in range(count):
+            if self.path_shown >= len(self.path):
+                self.phase = "done"
+                return
+            i, j, matched = self.path[self.path_shown]
+            self.draw_cell(i, j, self.matrix[i][j], GREEN if matched else YELLOW)
+            if matched:
+                self.lcs = self.seq1[i - 1] + self.lcs
+            self.path_shown += 1
+        if self.path_shown >= len(self.path):
+            self.phase = "done"
+
+    def update(self):
+        """Advance the animation by one frame and return the changed areas of ``surface``."""
+        if self.phase == "fill":
+            self.progress += self.speed
+            count, self.progress = int(self.progress), self.progress % 1
+            self.fill_cells(count)
+        elif self.phase == "traceback":
+            self.progress += self.path_speed
+            count, self.progress = int(self.progress), self.progress % 1
+            self.trace_cells(count)
+        dirty, self.dirty = self.dirty, []
+        return dirty
+
+    def finish(self):
+        """Skip the rest of the animation."""
+        if self.phase == "fill":
+            for _, _, self.matrix in self.steps:
+                pass
+            for i in range(1, len(self.seq1) + 1):
+                for j in range(1, len(self.seq2) + 1):
+                    self.draw_cell(i, j, self.matrix[i][j])
+            self.current = None
+            self.end_fill()
+        if self.phase == "traceback":
+            self.trace_cells(len(self.path))
+        self.dirty = [self.surface.get_rect()]
+
+    def status(self):
+        """One line describing what the animation is doing."""
+        if self.phase == "fill" and self.current is not None:
+            i, j, value = self.current
+            char1, char2 = self.seq1[i - 1], self.seq2[j - 1]
+            if char1 == char2:
+                return f"{char1} = {char2}: diagonal + 1 = {value}"
+            return f"{char1} and {char2} differ: keep the bigger neighbour, {value}"
+        if self.phase == "fill":
+            return "Filling the table..."
+        if self.phase == "traceback":
+            return f"Following the arrows back: {self.lcs}"
+        return f"LCS: {self.lcs or '(none)'}  length {len(self.lcs)}"
@@ -1,103 +1,132 @@
 import pygame
-import json
-import os
-from settings import WIDTH, HEIGHT, WHITE, BLACK, GREEN, FONT_PATH
+from settings import WIDTH, WHITE, BLACK, GREEN, GRAY, PLAYER
+from app import get_screen
+from assets import get_background
+from text_cache import render_text
+from renderer import DirtyRenderer
+from frame_clock import FramePacer
+from scores import get_score_store
+from leaderboard import get_leaderboard
+from profiler import profiler
 
-BASE_DIR = os.path.dirname(os.path.abspath(__file__))  # Get the absolute path of the script's directory
+# Leaderboards shown next to the menu, switched with Left/Right
+BOARD_PERIODS = [("all", "All Time"), ("week", "This Week"), ("day", "Today")]
+BOARD_SIZE = 8
+BOARD_RECT = pygame.Rect(30, 200, 300, 380)
 
-# Load highest score from JSON
-SCORE_FILE = os.path.join(BASE_DIR, "assets", "score.json") 
+# Frame rate while the player is using the menu; an idle menu only wakes up for input
+MENU_FPS = 30
 
-# remove background
-BG_IMAGE_PATH = os.path.join(BASE_DIR, "assets", "sun.png") 
-
-
-def load_existing_data():
-    """Load the existing score data, handling missing or corrupted files."""
-    if os.path.exists(SCORE_FILE):
-        print(f"Load Score Path: {SCORE_FILE}")
-        with open(SCORE_FILE, "r") as file:
-            try:
-                return json.load(file)
-            except json.JSONDecodeError:
-                return {}
-    return {}
 
 def load_highest_score():
     """Load the highest score, returning 0 if not found."""
-    return load_existing_data().get("highest_score", 0)
+    return get_score_store().get("highest_score")
 
 def load_highest_level():
     """Load the highest level, returning 0 if not found."""
-    return load_existing_data().get("highest_level", 0)
+    return get_score_store().get("highest_level")
 
 def save_highest_score(score):
     """Update the highest score while preserving other fields."""
-    data = load_existing_data()
-    data["highest_score"] = score
-    save_data(data)
+    get_score_store().set("highest_score", score)
 
 def save_highest_level(level):
     """Update the highest level while preserving other fields."""
-    data = load_existing_data()
-    data["highest_level"] = level
-    save_data(data)
-
-def save_data(data):
-    """Ensure the directory exists before saving the updated score data."""
-    os.makedirs(os.path.dirname(SCORE_FILE), exist_ok=True)  # ✅ Create directory if missing
-    print(f"Save Score Path: {SCORE_FILE}")
-    with open(SCORE_FILE, "w") as file:
-        json.dump(data, file)
-
-# Initialize pygame
-pygame.init()
-screen = pygame.display.set_mode((WIDTH, HEIGHT))
-pygame.display.set_caption("LCS Game Menu")
+    get_score_store().set("highest_level", level)
 
 class Menu:
     """Class representing the game menu."""
 
     def __init__(self):
         """Initialize the menu."""
-        self.menu_items = ["Start Game", "Tutorial", "Quit"]
+        self.menu_items = ["Start Game", "Tutorial", "Race", "Multi-Word", "More Puzzles", "Quit"]
         self.selected_item = 0
         self.running = True
         self.highest_score = load_highest_score()
         self.highest_level = load_highest_level()
         self.update_dimensions()
+        self.board_period = 0
+        self.load_board()
+        self.changed = True
 
         # load BG
-        self.bg_image = pygame.image.load(BG_IMAGE_PATH)
-        self.bg_image = pygame.transform.scale(self.bg_image, (WIDTH, HEIGHT))
+        self.bg_image = get_background()
+        self.renderer = DirtyRenderer(get_screen(), self.build_background())
+
+    def reset(self):
+        """Prepare a menu that is shown again after a game or the tutorial."""
+        self.running = True
+        self.selected_item = 0
+        self.highest_score = load_highest_score()
+        self.highest_level = load_highest_level()
+        self.load_board()
+        self.changed = True
+        self.renderer.invalidate()  # another screen has drawn over the window
+
+    def build_background(self):
+        background = self.bg_image.copy()
+        pygame.draw.rect(background, GRAY, BOARD_RECT, border_radius=20)
+        return background
+
+    def load_board(self):
+        """Fetch the selected leaderboard; only done when it changes, never per frame."""
+        period = BOARD_PERIODS[self.board_period][0]
+        leaderboard = get_leaderboard()
+        self.board = leaderboard.top(BOARD_SIZE, period)
+        self.board_rank = leaderboard.player_rank(PLAYER, period)
+        self.board_runs = leaderboard.size(period)
 
     def update_dimensions(self):
         """Update menu dimensions based on the current screen size."""
-        self.screen_width, self.screen_height = screen.get_size()
-        self.font = pygame.font.Font(FONT_PATH, int(self.screen_height * 0.05))
+        self.screen_width, self.screen_height = get_screen().get_size()
+        self.font_size = int(self.screen_height * 0.05)
         self.center_x = self.screen_width // 2
         self.center_y = self.screen_height // 2.5
 
     def draw(self):
-        """Draw the menu on the screen."""
-        # screen.fill(BLACK)
-        screen.blit(self.bg_image, (0, 0))
+        """Draw the menu on the screen, updating only the items that changed."""
+        self.changed = False
         for idx, item in enumerate(self.menu_items):
             color = GREEN if idx == self.selected_item else WHITE
-            text = self.font.render(item, True, color)
+            text = render_text(item, color, self.font_size)
             text_rect = text.get_rect(center=(self.center_x, self.center_y + idx * int(self.screen_height * 0.1)))
-            screen.blit(text, text_rect)
-        score_text = self.font.render(f"Highest Score: {self.highest_score}", True, BLACK)
+            self.renderer.draw(f"item{idx}", text, text_rect)
+        score_text = render_text(f"Highest Score: {self.highest_score}", BLACK, self.font_size)
         score_rect = score_text.get_rect(topright=(WIDTH - 50, 30))
-        screen.blit(score_text, score_rect)
-        level_text = self.font.render(f"Highest Level: {self.highest_level}", True, BLACK)
+        self.renderer.draw("score", score_text, score_rect)
+        level_text = render_text(f"Highest Level: {self.highest_level}", BLACK, self.font_size)
         level_rect = score_text.get_rect(topleft=(50, 30))
-        screen.blit(level_text, level_rect)
-        pygame.display.flip()
-
-    def handle_input(self):
+        self.renderer.draw("level", level_text, level_rect)
+        self.draw_board()
+        profiler.draw_overlay(self.renderer)
+        self.renderer.present()
+
+    def draw_board(self):
+        small_size = int(self.screen_height * 0.03)
+        title = render_text(f"< {BOARD_PERIODS[self.board_period][1]} >", WHITE, small_size)
+        self.renderer.draw("board_title", title, title.get_rect(midtop=(BOARD_RECT.centerx, BOARD_RECT.top + 15)))
+        for place, (player, score, level, _) in enumerate(self.board, 1):
+            color = GREEN if player == PLAYER else WHITE
+            name = render_text(f"{place}. {player or '-'}"[:14], color, small_size)
+            self.renderer.draw(f"board_name{place}", name, (BOARD_RECT.left + 20, BOARD_RECT.top + 25 + place * 32))
+            points = render_text(str(score), color, small_size)
+            self.renderer.draw(f"board_score{place}", points,
+                               points.get_rect(topright=(BOARD_RECT.right - 20, BOARD_RECT.top + 25 + place * 32)))
+        if not self.board:
+            empty = render_text("No games yet", WHITE, small_size)
+            self.renderer.draw("board_empty", empty, empty.get_rect(center=BOARD_RECT.center))
+        if self.board_rank is not None:
+            rank = render_text(f"You: #{self.board_rank} of {self.board_runs}", GREEN, small_size)
+            self.renderer.draw("board_rank", rank, rank.get_rect(midbottom=(BOARD_RECT.centerx, BOARD_RECT.bottom - 15)))
+
+    def handle_input(self, events=None):
         """Handle user input for menu navigation."""
-        for event in pygame.event.get():
+        events = pygame.event.get() if events is None else events
+        if events:
+            self.changed = True
+        for event in events:
+            if profiler.handle_event(event):
+                continue
             if event.type == pygame.QUIT:
                 self.running = False
             elif event.type == pygame.KEYDOWN:
@@ -105,22 +134,65 @@ class Menu:
                     self.selected_item = (self.selected_item + 1) % len(self.menu_items)
                 elif event.key == pygame.K_UP:
                     self.selected_item = (self.selected_item - 1) % len(self.menu_items)
+                elif event.key in (pygame.K_LEFT, pygame.K_RIGHT):
+                    step = 1 if event.key == pygame.K_RIGHT else -1
+                    self.board_period = (self.board_period + step) % len(BOARD_PERIODS)
+                    self.load_board()
                 elif event.key == pygame.K_RETURN:
                     if self.selected_item == 0:
                         return "start"
                     elif self.selected_item == 1:
                         return "tutorial"
                     elif self.selected_item == 2:
+                        return "race"
+                    elif self.selected_item == 3:
+                        return "multi"
+                    elif self.selected_item == 4:
+                        return "puzzles"
+                    elif self.selected_item == 5:
                         return "quit"
         return "none"
 
-def init_menu():
-    """Initialize and display the menu."""
-    menu = Menu()
+def init_menu(menu=None, on_first_frame=None):
+    """Initialize and display the menu.
+
+    Pass the ``Menu`` from an earlier call to show it again without reloading
+    it. ``on_first_frame`` is called once the first frame is on screen, so
+    startup work can wait until the player already sees the menu.
+    """
+    if menu is None:
+        menu = Menu()
+    else:
+        menu.reset()
+    pacer = FramePacer(MENU_FPS)
     while menu.running:
-        menu.update_dimensions()
-        menu.draw()
-        action = menu.handle_input()
-        if action in ["start", "tutorial", "quit"]:
+        # Nothing on the menu moves, so it is only redrawn after input
+        if menu.changed or profiler.enabled:
+            menu.update_dimensions()
+            menu.draw()
+        if on_first_frame is not None:
+            on_first_frame()
+            on_first_frame = None
+        action = menu.handle_input(pacer.wait())
+        profiler.frame()
+        if action in ["start", "tutorial", "race", "multi", "puzzles", "quit"]:
             return action
-        pygame.time.Clock().tick(30)
\ No newline at end of file
+
+async def init_menu_async(menu=None, on_first_frame=None):
+    """Same as ``init_menu`` but yields to the asyncio event loop every frame."""
+    if menu is None:
+        menu = Menu()
+    else:
+        menu.reset()
+    pacer = FramePacer(MENU_FPS)
+    while menu.running:
+        if menu.changed or profiler.enabled:
+            menu.update_dimensions()
+            menu.draw()
+        if on_first_frame is not None:
+            on_first_frame()
+            on_first_frame = None
+        action = menu.handle_input(await pacer.wait_async())
+        profiler.frame()
+        if action in ["start", "tutorial", "race", "multi", "puzzles", "quit"]:
+            return action
\ No newline at end of file
@@ -0,0 +1,90 @@
+import os
+import random
+
+from settings import WHITE
+from lcs import LCSGame
+from lcs_engine import MultiLCS, MultiMatcher
+from profiler import profiler
+from text_cache import render_text
+
+# Words in the first puzzles; one more every few levels, up to the maximum
+MIN_WORDS = 3
+MAX_WORDS = int(os.environ.get("LCS_MULTI_MAX_WORDS", "5"))
+LEVELS_PER_WORD = 3
+
+# Length range of the words; long words keep the common subsequences from getting trivial
+MIN_WORD_LENGTH = 6
+MAX_WORD_LENGTH = 14
+
+# Random words tried for every word added to a puzzle; the one keeping the longest answer wins
+CANDIDATES = 20
+
+MULTI_TIME_LIMIT = 90
+
+
+def choose_words(word_index, count, min_length=MIN_WORD_LENGTH, max_length=MAX_WORD_LENGTH,
+                 rng=random, candidates=CANDIDATES):
+    """Pick ``count`` words with a common subsequence worth finding and return their ``MultiLCS``.
+
+    Random words of this length rarely share more than a letter or two, so
+    the puzzle is grown one word at a time: each step solves a few random
+    candidates together with the words picked so far and keeps the one with
+    the longest answer. Every solve visits only a handful of dominant states,
+    so even five words of 12+ letters take a few tens of milliseconds.
+    """
+    words = [word_index.random_word(min_length, max_length, rng)]
+    best = None
+    while len(words) < count:
+        options = [MultiLCS(words + [word_index.random_word(min_length, max_length, rng)])
+                   for _ in range(candidates)]
+        best = max(options, key=lambda solutions: solutions.length)
+        words = list(best.words)
+    return best
+
+
+class MultiLCSGame(LCSGame):
+    """``LCSGame`` that asks for the longest subsequence common to three or more words.
+
+    Puzzles start with ``MIN_WORDS`` words and grow to ``MAX_WORDS``. Answers
+    are checked with a ``MultiLCS`` and typed input follows a
+    ``MultiMatcher``, so live feedback works as in the pair game. The
+    difficulty model and leaderboard are calibrated for word pairs, so this
+    mode does not feed either.
+    """
+
+    title = "Multi LCS!"
+    invalid_hint = "Not in all words"
+    ranked = False
+
+    def __init__(self, **kwargs):
+        self.selection = None
+        super().__init__(**kwargs)
+        self.time_limit = MULTI_TIME_LIMIT
+
+    def word_count(self):
+        return min(MAX_WORDS, MIN_WORDS + (self.level - 1) // LEVELS_PER_WORD)
+
+    def get_new_word_pair(self):
+        with profiler.section("lcs"):
+            self.selection = choose_words(self.word_index, self.word_count(), rng=self.rng)
+        self.current_puzzle = None
+        return self.selection.words
+
+    def solve(self, words):
+        # The puzzle was already solved while choosing its words
+        solutions = self.selection if self.selection.words == tuple(words) else MultiLCS(words)
+        return solutions, MultiMatcher(solutions)
+
+    def draw_words(self):
+        # Two columns of up to three rows fit in the word panel
+        for index, word in enumerate(self.current_pair):
+            column, row = divmod(index, 3)
+            text = render_text(f"Word {index + 1}: {word}", WHITE)
+            self.renderer.draw(f"word{index + 1}", text, (50 + column * 470, 145 + row * 30))
+
+    def points(self, sequence):
+        # Every extra word makes a common letter rarer
+        return len(sequence) * 10 * (len(self.current_pair) - 1)
+
+    def find_lcs(self, *words):
+        return self.solutions.solution()
@@ -0,0 +1,179 @@
+import atexit
+import json
+import os
+import threading
+import time
+from collections import deque
+
+import pygame
+from settings import WHITE, GREEN, RED, YELLOW
+
+OVERLAY_BG = (0, 0, 0, 170)
+
+TOGGLE_KEY = pygame.K_F3
+DUMP_KEY = pygame.K_F4
+
+TRACE_PATH = os.environ.get("LCS_PROFILE_TRACE", "lcs_trace.json")
+
+
+class _NullSection:
+    """Shared no-op section returned while profiling is disabled."""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULL_SECTION = _NullSection()
+
+
+class _Section:
+    def __init__(self, profiler, name):
+        self.profiler = profiler
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.profiler.add(self.name, self.start, time.perf_counter())
+        return False
+
+
+class Profiler:
+    """Frame-time and per-subsystem timing, an in-game overlay and trace dumps.
+
+    Code wraps hot paths in ``with profiler.section("render"):``; while the
+    profiler is disabled that returns a shared no-op object, so the hooks
+    cost one attribute check per call. F3 toggles the overlay, F4 writes the
+    recorded trace in Chrome's trace-event format (``chrome://tracing``).
+    """
+
+    def __init__(self, enabled=False, history=240, trace_limit=200000):
+        self.enabled = enabled
+        self.frame_times = deque(maxlen=history)
+        self.section_times = {}
+        self.current = {}
+        self.trace = deque(maxlen=trace_limit)
+        self.lock = threading.Lock()
+        self.last_frame = time.perf_counter()
+        self.overlay = None
+        self.overlay_age = 0
+
+    def toggle(self):
+        self.enabled = not self.enabled
+        self.last_frame = time.perf_counter()
+
+    def section(self, name):
+        """Context manager timing one subsystem; free when disabled."""
+        if not self.enabled:
+            return _NULL_SECTION
+        return _Section(self, name)
+
+    def add(self, name, start, end):
+        with self.lock:
+            self.current[name] = self.current.get(name, 0.0) + (end - start)
+            self.trace.append({
+                "name": name,
+                "ph": "X",
+                "ts": start * 1e6,
+                "dur": (end - start) * 1e6,
+                "pid": os.getpid(),
+                "tid": threading.get_ident(),
+            })
+
+    def frame(self):
+        """Mark the end of a frame."""
+        if not self.enabled:
+            return
+        now = time.perf_counter()
+        with self.lock:
+            self.frame_times.append(now - self.last_frame)
+            for name in set(self.section_times) | set(self.current):
+                times = self.section_times.setdefault(name, deque(maxlen=self.frame_times.maxlen))
+                times.append(self.current.get(name, 0.0))
+            self.current = {}
+        self.last_frame = now
+
+    def handle_event(self, event):
+        """Handle the profiler hotkeys; returns True if the event was consumed."""
+        if event.type != pygame.KEYDOWN:
+            return False
+        if event.key == TOGGLE_KEY:
+            self.toggle()
+            return True
+        if event.key == DUMP_KEY:
+            self.dump()
+            return True
+        return False
+
+    def stats(self):
+        with self.lock:
+            frame_times = list(self.frame_times)
+            sections = {name: sum(times) / len(times) for name, times in self.section_times.items() if times}
+        average = sum(frame_times) / len(frame_times) if frame_times else 0.0
+        return {
+            "fps": 1 / average if average else 0.0,
+            "frame_ms": average * 1000,
+            "worst_ms": max(frame_times, default=0.0) * 1000,
+            "sections_ms": {name: value * 1000 for name, value in sections.items()},
+        }
+
+    def render_overlay(self):
+        """Build the overlay surface: FPS, frame-time histogram, sections and cache stats."""
+        from text_cache import render_text, text_cache_stats
+
+        stats = self.stats()
+        cache = text_cache_stats()
+        lines = [
+            f"FPS {stats['fps']:.0f}  frame {stats['frame_ms']:.2f} ms  worst {stats['worst_ms']:.2f} ms",
+        ]
+        for name, value in sorted(stats["sections_ms"].items()):
+            lines.append(f"{name}: {value:.3f} ms")
+        lines.append(f"text cache: {cache['surfaces']} surfaces, {cache['bytes'] // 1024} KiB, "
+                     f"{cache['hits']} hits, {cache['misses']} misses, {cache['evictions']} evicted")
+
+        width, line_height, histogram_height = 460, 18, 50
+        surface = pygame.Surface((width, 10 + histogram_height + len(lines) * line_height), pygame.SRCALPHA)
+        surface.fill(OVERLAY_BG)
+
+        # One bar per frame, scaled so the full height is 33 ms
+        with self.lock:
+            frame_times = list(self.frame_times)[-(width - 10):]
+        for x, frame_time in enumerate(frame_times):
+            height = min(histogram_height, int(frame_time / 0.033 * histogram_height))
+            color = GREEN if frame_time <= 1 / 60 else YELLOW if frame_time <= 1 / 30 else RED
+            pygame.draw.line(surface, color, (5 + x, 5 + histogram_height), (5 + x, 5 + histogram_height - height))
+
+        for i, line in enumerate(lines):
+            surface.blit(render_text(line, WHITE, 16, None), (5, 10 + histogram_height + i * line_height))
+        return surface
+
+    def draw_overlay(self, renderer, refresh_frames=10):
+        """Place the overlay on a ``DirtyRenderer``, rebuilding it every few frames."""
+        if not self.enabled:
+            return
+        self.overlay_age -= 1
+        if self.overlay is None or self.overlay_age <= 0:
+            self.overlay = self.render_overlay()
+            self.overlay_age = refresh_frames
+        renderer.draw("profiler", self.overlay, (5, 5))
+
+    def dump(self, path=TRACE_PATH):
+        """Write the recorded sections as a Chrome trace."""
+        with self.lock:
+            events = list(self.trace)
+        if not events:
+            return
+        with open(path, "w") as file:
+            json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, file)
+        print(f"Profiler trace written to {path}")
+
+
+profiler = Profiler(enabled=os.environ.get("LCS_PROFILE") == "1")
+
+if "LCS_PROFILE_TRACE" in os.environ:
+    atexit.register(profiler.dump)
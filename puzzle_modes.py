@@ -0,0 +1,212 @@
+import pygame
+from settings import DARK_GREEN
+from lcs import LCSGame
+from dp_kernel import edit_alignment, longest_common_substrings, supersequence_alignment, supersequence_length
+from lcs_engine import is_subsequence
+from profiler import profiler
+
+# Random pairs tried for each puzzle; the most interesting one is used
+CANDIDATES = 8
+
+MODES_TIME_LIMIT = 90
+
+
+class SubstringPuzzle:
+    """Longest run of letters that appears unbroken in both words."""
+
+    title = "Common Substring!"
+    label = "Your substring:"
+    invalid_hint = "Not part of a longest one"
+    word_lengths = (6, 10)
+    digits = False
+
+    def __init__(self, word1, word2):
+        self.words = (word1, word2)
+        # Every longest common substring counts, so typing is checked against all of them
+        self.answers = longest_common_substrings(word1, word2)
+        self.answer = min(self.answers, default="")
+        self.length = len(self.answer)
+        self.interest = self.length
+
+    def fits(self, typed):
+        """True while ``typed`` can still grow into an answer."""
+        return not typed or any(typed in answer for answer in self.answers)
+
+    def hint(self, typed):
+        return f"Can still add: {self.length - len(typed)}"
+
+    def __contains__(self, answer):
+        return answer in self.answers
+
+    def matched_indices(self, answer):
+        return [list(range(word.find(answer), word.find(answer) + len(answer))) for word in self.words]
+
+    def points(self, answer):
+        return len(answer) * 10
+
+
+class EditPuzzle:
+    """Fewest letters to insert, delete or change to turn the first word into the second."""
+
+    title = "Edit Distance!"
+    label = "Edits needed:"
+    invalid_hint = "At most two digits"
+    word_lengths = (4, 7)
+    digits = True
+
+    def __init__(self, word1, word2):
+        self.words = (word1, word2)
+        distance, self.kept = edit_alignment(word1, word2)
+        self.answer = str(distance)
+        # Pairs that keep a few letters are more fun to work out than complete rewrites
+        self.interest = len(self.kept[0])
+
+    def fits(self, typed):
+        return len(typed) <= 2 and (typed.isdecimal() or not typed)
+
+    def hint(self, typed):
+        return "Type a number"
+
+    def __contains__(self, answer):
+        return answer.isdecimal() and int(answer) == int(self.answer)
+
+    def matched_indices(self, answer):
+        return self.kept
+
+    def points(self, answer):
+        return (int(self.answer) + 1) * 10
+
+
+class SupersequencePuzzle:
+    """Shortest word that contains both words as subsequences."""
+
+    title = "Supersequence!"
+    label = "Your word:"
+    invalid_hint = "No shortest word starts so"
+    word_lengths = (4, 6)
+    digits = False
+
+    def __init__(self, word1, word2):
+        self.words = (word1, word2)
+        self.answer, self.shared = supersequence_alignment(word1, word2)
+        self.length = len(self.answer)
+        self.interest = len(self.shared[0])
+
+    def fits(self, typed):
+        """True if some shortest supersequence starts with ``typed``.
+
+        Tracks every way of reading ``typed`` as an interleaving of prefixes of
+        both words, and drops those whose remaining suffixes cannot be merged
+        within the letters left; the banded kernel makes that check cheap.
+        """
+        a, b = self.words
+        states = {(0, 0)}
+        for count, char in enumerate(typed, 1):
+            following = set()
+            for i, j in states:
+                in_a, in_b = i < len(a) and a[i] == char, j < len(b) and b[j] == char
+                if in_a and in_b:
+                    following.add((i + 1, j + 1))
+                if in_a:
+                    following.add((i + 1, j))
+                if in_b:
+                    following.add((i, j + 1))
+            left = self.length - count
+            states = {(i, j) for i, j in following if supersequence_length(a[i:], b[j:], left) <= left}
+            if not states:
+                return False
+        return True
+
+    def hint(self, typed):
+        return f"Letters left: {self.length - len(typed)}"
+
+    def __contains__(self, answer):
+        return len(answer) == self.length and all(is_subsequence(word, answer) for word in self.words)
+
+    def matched_indices(self, answer):
+        return self.shared
+
+    def points(self, answer):
+        return len(self.shared[0]) * 10 + 10
+
+
+PUZZLES = (SubstringPuzzle, EditPuzzle, SupersequencePuzzle)
+
+
+def choose_puzzle(kind, word_index, rng, candidates=CANDIDATES):
+    """Solve a few random pairs for ``kind`` and return the most interesting puzzle."""
+    return max((kind(*word_index.random_pair(*kind.word_lengths, rng)) for _ in range(candidates)),
+               key=lambda puzzle: puzzle.interest)
+
+
+class PuzzleMatcher:
+    """Live input check for a puzzle, with the interface of ``IncrementalMatcher``."""
+
+    def __init__(self, puzzle):
+        self.puzzle = puzzle
+        self.reset()
+
+    def reset(self):
+        self.typed = ""
+        self.valid = True
+
+    def push(self, char):
+        self.typed += char
+        self.valid = self.puzzle.fits(self.typed)
+        return self.valid
+
+    def pop(self):
+        self.typed = self.typed[:-1]
+        self.valid = self.puzzle.fits(self.typed)
+
+
+class PuzzleModesGame(LCSGame):
+    """``LCSGame`` taking turns between the other ``dp_kernel`` puzzles.
+
+    Every pair asks for something different: the longest common substring,
+    the edit distance, or the shortest common supersequence. Each puzzle is
+    solved once by the shared DP kernel when it is picked; typed input is
+    checked against it on every keystroke. Like the multi-word mode, these
+    games stay out of the difficulty model and the leaderboard.
+    """
+
+    ranked = False
+
+    def __init__(self, **kwargs):
+        self.puzzle = None
+        self.puzzles_shown = 0
+        super().__init__(**kwargs)
+        self.time_limit = MODES_TIME_LIMIT
+
+    def get_new_word_pair(self):
+        kind = PUZZLES[self.puzzles_shown % len(PUZZLES)]
+        self.puzzles_shown += 1
+        with profiler.section("lcs"):
+            self.puzzle = choose_puzzle(kind, self.word_index, self.rng)
+        self.current_puzzle = None
+        self.title, self.sequence_label, self.invalid_hint = kind.title, kind.label, kind.invalid_hint
+        return self.puzzle.words
+
+    def solve(self, words):
+        return self.puzzle, PuzzleMatcher(self.puzzle)
+
+    def hint(self):
+        if self.matcher.valid:
+            return self.puzzle.hint(self.user_sequence), DARK_GREEN
+        return super().hint()
+
+    def handle_input(self, event):
+        if event.type == pygame.KEYDOWN and self.puzzle.digits:
+            if event.unicode.isdecimal():
+                self.user_sequence += event.unicode
+                self.matcher.push(event.unicode)
+                return None
+            if event.unicode.isalpha():
+                return None
+        return super().handle_input(event)
+
+    def points(self, sequence):
+        return self.puzzle.points(sequence)
+
+    def find_lcs(self, *words):
+        return self.puzzle.answer
@@ -0,0 +1,201 @@
+import argparse
+import math
+import mmap
+import os
+import random
+import struct
+import time
+from collections import namedtuple
+from multiprocessing import Pool
+
+from corpus import get_word_index
+from lcs_engine import lcs_length, count_lcs
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))  # Get the absolute path of the script's directory
+
+POOL_PATH = os.environ.get("LCS_PUZZLE_POOL", os.path.join(BASE_DIR, "assets", "puzzles.bin"))
+
+# magic, format version, record count; records follow sorted by difficulty
+POOL_MAGIC = b"LCSP"
+POOL_VERSION = 2
+HEADER = struct.Struct("<4sHxxI")
+
+# word1, word2, lcs length, number of distinct optimal answers (saturated), difficulty
+MAX_WORD_LENGTH = 20
+RECORD = struct.Struct(f"<{MAX_WORD_LENGTH}s{MAX_WORD_LENGTH}sBxHf")
+MAX_SOLUTIONS = 0xFFFF
+
+# The difficulty is the last field of a record, so it can be read without unpacking the words
+DIFFICULTY = struct.Struct("<f")
+DIFFICULTY_OFFSET = RECORD.size - DIFFICULTY.size
+
+# Random pairs a worker may try per requested puzzle before it gives up on the rest
+ATTEMPTS_PER_PUZZLE = 100
+
+# Share of the pool around the target difficulty that ``draw_near`` picks from
+NEAR_WINDOW = 0.005
+
+Puzzle = namedtuple("Puzzle", ["word1", "word2", "lcs_length", "solutions", "difficulty"])
+
+
+def difficulty_score(word1, word2, length, solutions):
+    """Higher is harder: longer answers, more letters to skip and fewer distinct correct answers."""
+    skipped = len(word1) + len(word2) - 2 * length
+    return length + 0.25 * skipped - math.log2(max(solutions, 1))
+
+
+def score_pair(word1, word2):
+    """Build the ``Puzzle`` for a word pair."""
+    length = lcs_length(word1, word2)
+    solutions = count_lcs(word1, word2)
+    return Puzzle(word1, word2, length, solutions, difficulty_score(word1, word2, length, solutions))
+
+
+def pack_puzzle(puzzle):
+    return RECORD.pack(
+        puzzle.word1.encode("ascii"),
+        puzzle.word2.encode("ascii"),
+        puzzle.lcs_length,
+        min(puzzle.solutions, MAX_SOLUTIONS),
+        puzzle.difficulty,
+    )
+
+
+def unpack_puzzle(data, offset=0):
+    word1, word2, length, solutions, difficulty = RECORD.unpack_from(data, offset)
+    return Puzzle(word1.rstrip(b"\0").decode("ascii"), word2.rstrip(b"\0").decode("ascii"), length, solutions, difficulty)
+
+
+def _generate_chunk(args):
+    """Worker: score ``count`` random pairs and return ``(difficulty, record)`` tuples.
+
+    Returns fewer records if too few pairs pass the filters, e.g. with an
+    unreachable ``min_lcs``.
+    """
+    seed, count, min_length, max_length, min_lcs = args
+    rng = random.Random(seed)
+    index = get_word_index()
+    max_length = min(max_length, MAX_WORD_LENGTH)
+    records = []
+    for _ in range(count * ATTEMPTS_PER_PUZZLE):
+        if len(records) == count:
+            break
+        word1, word2 = index.random_pair(min_length, max_length, rng)
+        # The same word twice would be the "hardest" puzzle while only asking to retype it
+        if word1 == word2 or not (word1.isascii() and word2.isascii()):
+            continue
+        puzzle = score_pair(word1, word2)
+        if puzzle.lcs_length < min_lcs:
+            continue
+        records.append((puzzle.difficulty, pack_puzzle(puzzle)))
+    return records
+
+
+def generate_pool(count, path=POOL_PATH, min_length=5, max_length=10, min_lcs=2,
+                  processes=None, seed=None, chunk_size=5000):
+    """Score ``count`` random word pairs in a process pool and write them to ``path``.
+
+    Records are sorted by difficulty, so ``PuzzlePool.draw_near`` can find
+    any difficulty with a binary search.
+    """
+    get_word_index()  # build the corpus cache once before the workers start
+    seed = random.randrange(2 ** 32) if seed is None else seed
+    jobs = []
+    for start in range(0, count, chunk_size):
+        jobs.append((seed + start, min(chunk_size, count - start), min_length, max_length, min_lcs))
+
+    records = []
+    with Pool(processes) as pool:
+        for chunk in pool.imap_unordered(_generate_chunk, jobs):
+            records.extend(chunk)
+    records.sort(key=lambda record: record[0])
+
+    temp_path = f"{path}.tmp"
+    with open(temp_path, "wb") as file:
+        file.write(HEADER.pack(POOL_MAGIC, POOL_VERSION, len(records)))
+        for _, record in records:
+            file.write(record)
+    os.replace(temp_path, path)
+    return len(records)
+
+
+class PuzzlePool:
+    """Read-only, memory-mapped view of a pool written by ``generate_pool``."""
+
+    def __init__(self, path=POOL_PATH):
+        with open(path, "rb") as file:
+            self.data = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, self.count = HEADER.unpack_from(self.data, 0)
+        if magic != POOL_MAGIC or version != POOL_VERSION:
+            self.data.close()
+            raise ValueError(f"Not a puzzle pool (or an old format, regenerate it): {path}")
+        self.records_start = HEADER.size
+
+    def __len__(self):
+        return self.count
+
+    def __getitem__(self, position):
+        return unpack_puzzle(self.data, self.records_start + position * RECORD.size)
+
+    def difficulty_at(self, position):
+        return DIFFICULTY.unpack_from(self.data, self.records_start + position * RECORD.size + DIFFICULTY_OFFSET)[0]
+
+    def find_difficulty(self, difficulty):
+        """Position of the first puzzle at least as hard as ``difficulty`` (records are sorted by it)."""
+        low, high = 0, self.count
+        while low < high:
+            middle = (low + high) // 2
+            if self.difficulty_at(middle) < difficulty:
+                low = middle + 1
+            else:
+                high = middle
+        return low
+
+    def draw_near(self, difficulty, rng=random):
+        """Pick a random puzzle among the few closest to ``difficulty``, in O(log n)."""
+        window = max(1, int(self.count * NEAR_WINDOW))
+        center = self.find_difficulty(difficulty)
+        start = max(0, min(center - window // 2, self.count - window))
+        return self[start + rng.randrange(min(window, self.count))]
+
+    def close(self):
+        self.data.close()
+
+
+_puzzle_pool = None
+
+
+def get_puzzle_pool():
+    """Return the shared puzzle pool, or None if no pool has been generated."""
+    global _puzzle_pool
+    if _puzzle_pool is None and os.path.exists(POOL_PATH):
+        try:
+            pool = PuzzlePool(POOL_PATH)
+            if len(pool):
+                _puzzle_pool = pool
+        except (OSError, ValueError, struct.error) as e:
+            print("Error loading puzzle pool:", e)
+    return _puzzle_pool
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Pre-generate scored LCS puzzles.")
+    parser.add_argument("--count", type=int, default=100000, help="number of puzzles to generate")
+    parser.add_argument("--out", default=POOL_PATH, help="output pool file")
+    parser.add_argument("--min-length", type=int, default=5)
+    parser.add_argument("--max-length", type=int, default=10)
+    parser.add_argument("--min-lcs", type=int, default=2, help="skip pairs with a shorter LCS")
+    parser.add_argument("--processes", type=int, default=None, help="worker processes (default: CPU count)")
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args()
+
+    start = time.time()
+    written = generate_pool(args.count, args.out, args.min_length, args.max_length, args.min_lcs,
+                            args.processes, args.seed)
+    print(f"Wrote {written} puzzles to {args.out} in {time.time() - start:.1f}s")
+    if written < args.count:
+        print(f"Only {written} of {args.count} pairs passed the filters; try a lower --min-lcs")
+
+
+if __name__ == "__main__":
+    main()
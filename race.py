@@ -0,0 +1,181 @@
+import asyncio
+import json
+import math
+import os
+import socket
+
+import pygame
+from settings import WHITE
+from lcs import LCSGame
+from race_server import DEFAULT_PORT, encode
+from text_cache import render_text
+
+# host:port of the race server on the local network
+RACE_SERVER = os.environ.get("LCS_RACE_SERVER", f"127.0.0.1:{DEFAULT_PORT}")
+
+# Name shown in the standings; defaults to the machine name, which is unique in a classroom
+RACE_NAME = os.environ.get("LCS_PLAYER") or socket.gethostname()
+
+CONNECT_TIMEOUT = 3.0
+
+# Lines of the standings shown next to the game
+STANDINGS_SHOWN = 5
+
+
+def race_address(address=RACE_SERVER):
+    host, _, port = address.rpartition(":")
+    return host or "127.0.0.1", int(port)
+
+
+class RaceClient:
+    """Connection to a ``RaceServer``; received messages wait in an inbox until polled."""
+
+    def __init__(self, reader, writer):
+        self.reader = reader
+        self.writer = writer
+        self.inbox = []
+        self.connected = True
+        self.task = asyncio.create_task(self.receive())
+
+    @classmethod
+    async def connect(cls, host, port, name=RACE_NAME, timeout=CONNECT_TIMEOUT):
+        reader, writer = await asyncio.wait_for(asyncio.open_connection(host, port), timeout)
+        client = cls(reader, writer)
+        client.send({"type": "join", "name": name})
+        return client
+
+    async def receive(self):
+        try:
+            while True:
+                line = await self.reader.readline()
+                if not line:
+                    break
+                try:
+                    self.inbox.append(json.loads(line))
+                except ValueError:
+                    pass
+        except (ConnectionError, ValueError):
+            pass
+        finally:
+            self.connected = False
+
+    def send(self, message):
+        if self.connected:
+            self.writer.write(encode(message))
+
+    def poll(self):
+        """Return the messages received since the last call."""
+        messages, self.inbox = self.inbox, []
+        return messages
+
+    async def close(self):
+        self.task.cancel()
+        self.writer.close()
+        try:
+            await self.writer.wait_closed()
+        except (ConnectionError, asyncio.CancelledError):
+            pass
+
+
+class RaceGame(LCSGame):
+    """``LCSGame`` whose word pairs come from a race server, which also checks the answers.
+
+    Every player gets the same pair at the same time. Typing keeps the local
+    live feedback, but Enter sends the answer to the server and the result,
+    the round timer and the standings all come back from it.
+    """
+
+    title = "LCS Race!"
+    controls = ["ENTER: submit", "BACKSPACE: delete", "ESC: Leave race"]
+
+    def __init__(self, client, **kwargs):
+        self.client = client
+        self.round = None
+        self.round_words = ("", "")
+        self.round_ends = None
+        self.solved = False
+        self.status = "Waiting for the next round..."
+        self.standings = []
+        self.players = 0
+        self.rank = None
+        super().__init__(**kwargs)
+        self.time_limit = math.inf  # a race lasts until the player leaves or the server stops
+
+    def get_new_word_pair(self):
+        self.current_puzzle = None
+        return self.round_words
+
+    def step(self, dt):
+        for message in self.client.poll():
+            self.handle_message(message)
+        if not self.client.connected and self.running:
+            print("Disconnected from the race server")
+            self.running = False
+        return super().step(dt)
+
+    def handle_message(self, message):
+        kind = message.get("type")
+        if kind == "round":
+            self.round = message["round"]
+            self.round_words = tuple(message["words"])
+            self.round_ends = self.time_source() + message["time"]
+            self.solved = False
+            self.status = f"Round {self.round}: go!"
+            self.next_pair()
+        elif kind == "result" and not message.get("late"):
+            if message["correct"]:
+                self.audio.play("correct")
+                self.solved = True
+                self.score = message["score"]
+                self.level += 1
+                self.status = f"Solved! +{message['points']} (#{message['place']})"
+            else:
+                self.wrong_answer_effect()
+        elif kind == "round_over":
+            self.round_ends = None
+            self.status = f"Solution: {message['solution']}"
+        elif kind == "standings":
+            self.standings = message["top"]
+            self.players = message["players"]
+        elif kind == "rank":
+            self.rank = message["rank"]
+
+    def handle_input(self, event):
+        if event.type == pygame.KEYDOWN and event.key == pygame.K_RETURN:
+            if self.round_ends is not None and not self.solved:
+                self.client.send({"type": "submit", "round": self.round, "answer": self.user_sequence})
+            return None
+        if event.type == pygame.KEYDOWN and event.key == pygame.K_SPACE:
+            return None  # no revealing the answer in a race
+        return super().handle_input(event)
+
+    def progress_text(self):
+        return f"Rank: {self.rank or '-'} / {self.players}"
+
+    def draw_screen(self, time_remaining):
+        round_remaining = 0 if self.round_ends is None else max(0, self.round_ends - self.time_source())
+        super().draw_screen(round_remaining)
+        status = render_text(self.status, WHITE, self.small_font_size)
+        self.renderer.draw("race_status", status, (620, 370))
+        header = render_text(f"Standings ({self.players} players)", WHITE, self.small_font_size)
+        self.renderer.draw("standings", header, (620, 398))
+        for place, (name, score) in enumerate(self.standings[:STANDINGS_SHOWN], 1):
+            line = render_text(f"{place}. {name}  {score}", WHITE, self.small_font_size)
+            self.renderer.draw(f"standing{place}", line, (620, 398 + place * 22))
+
+    def finish_game(self):
+        """Race scores live on the server; they do not count as local high scores."""
+
+
+async def run_race():
+    """Connect to ``LCS_RACE_SERVER`` and play until the player leaves; False if it cannot connect."""
+    try:
+        client = await RaceClient.connect(*race_address())
+    except (OSError, ValueError, asyncio.TimeoutError) as e:
+        print("Error connecting to the race server:", e)
+        return False
+    try:
+        await RaceGame(client).run_async()
+    finally:
+        await client.close()
+    return True
@@ -0,0 +1,254 @@
+import argparse
+import asyncio
+import json
+import random
+
+from lcs_engine import lcs, LCSSolutions
+
+DEFAULT_PORT = 8765
+
+# Puzzle difficulty used for every round (same scale as the puzzle pool)
+RACE_DIFFICULTY = 4.5
+
+# Seconds per round, and the pause that shows the solution before the next one
+ROUND_TIME = 30.0
+ROUND_PAUSE = 4.0
+
+# Standings are broadcast at most this often, however many answers come in
+STANDINGS_INTERVAL = 0.25
+STANDINGS_SIZE = 10
+
+# Extra points for the first correct answers of a round
+PLACE_BONUS = (30, 20, 10)
+
+MAX_NAME_LENGTH = 16
+# Longest accepted message, and how much may queue up for a client before it is dropped
+MAX_LINE = 1024
+MAX_BUFFER = 64 * 1024
+
+
+def encode(message):
+    return (json.dumps(message, separators=(",", ":")) + "\n").encode()
+
+
+class RacePlayer:
+    def __init__(self, player_id, name, writer):
+        self.id = player_id
+        self.name = name
+        self.writer = writer
+        self.score = 0
+        self.rank = None
+        self.solved_round = None
+
+
+class RaceServer:
+    """Hands the same word pair to every connected client and ranks their answers.
+
+    Clients speak JSON lines over TCP. They send ``join`` and ``submit``, and
+    receive ``round``, ``result``, ``round_over``, ``standings`` and ``rank``.
+    Answers are checked against the round's ``LCSSolutions``, the same way
+    ``LCSGame`` checks them, so any optimal answer counts. Broadcasts are
+    encoded once for all clients, and standings are batched to a few per
+    second. A client that stops reading is disconnected instead of
+    buffering without bound.
+    """
+
+    def __init__(self, difficulty=RACE_DIFFICULTY, round_time=ROUND_TIME, round_pause=ROUND_PAUSE, rng=None):
+        self.difficulty = difficulty
+        self.round_time = round_time
+        self.round_pause = round_pause
+        self.rng = rng or random.Random()
+        self.players = {}
+        self.next_id = 1
+        self.round = 0
+        self.pair = None
+        self.solutions = None
+        self.finishers = 0
+        self.joined = asyncio.Event()
+        self.round_done = asyncio.Event()
+        self.standings_pending = False
+        self.server = None
+        self.rounds_task = None
+        self.handlers = set()
+
+    def new_pair(self):
+        from puzzles import get_puzzle_pool
+
+        pool = get_puzzle_pool()
+        if pool is not None:
+            puzzle = pool.draw_near(self.difficulty, self.rng)
+            return puzzle.word1, puzzle.word2
+        from corpus import get_word_index
+
+        return get_word_index().random_pair(5, 10, self.rng)
+
+    async def start(self, host="0.0.0.0", port=DEFAULT_PORT):
+        """Start listening (port 0 picks a free one) and return the bound port."""
+        self.server = await asyncio.start_server(self.handle_client, host, port, limit=MAX_LINE)
+        self.rounds_task = asyncio.create_task(self.run_rounds())
+        return self.server.sockets[0].getsockname()[1]
+
+    async def close(self):
+        if self.rounds_task is not None:
+            self.rounds_task.cancel()
+        for player in list(self.players.values()):
+            player.writer.close()
+        # Let every connection handler see its socket close and finish on its own
+        if self.handlers:
+            await asyncio.wait(self.handlers, timeout=1.0)
+        if self.server is not None:
+            self.server.close()
+            await self.server.wait_closed()
+
+    async def run_rounds(self):
+        while True:
+            if not self.players:
+                self.joined.clear()
+                await self.joined.wait()
+            self.round += 1
+            self.pair = self.new_pair()
+            self.solutions = LCSSolutions(*self.pair)
+            self.finishers = 0
+            self.round_done.clear()
+            self.broadcast({"type": "round", "round": self.round, "words": list(self.pair),
+                            "length": self.solutions.length, "time": self.round_time})
+            try:
+                await asyncio.wait_for(self.round_done.wait(), self.round_time)
+            except asyncio.TimeoutError:
+                pass
+            self.round_done.set()  # answers arriving during the pause are late
+            self.broadcast({"type": "round_over", "round": self.round, "solution": lcs(*self.pair)})
+            self.send_standings()
+            await asyncio.sleep(self.round_pause)
+
+    async def handle_client(self, reader, writer):
+        player = None
+        task = asyncio.current_task()
+        self.handlers.add(task)
+        try:
+            while True:
+                try:
+                    line = await reader.readline()
+                except (ValueError, asyncio.LimitOverrunError):
+                    break  # longer than any valid message
+                if not line:
+                    break
+                try:
+                    message = json.loads(line)
+                except ValueError:
+                    continue
+                if not isinstance(message, dict):
+                    continue
+                if player is None:
+                    if message.get("type") == "join":
+                        player = self.join(str(message.get("name", ""))[:MAX_NAME_LENGTH], writer)
+                elif message.get("type") == "submit":
+                    self.submit(player, message.get("round"), str(message.get("answer", "")))
+        except ConnectionError:
+            pass
+        finally:
+            if player is not None:
+                self.leave(player)
+            writer.close()
+            self.handlers.discard(task)
+
+    def join(self, name, writer):
+        player = RacePlayer(self.next_id, name or f"Player {self.next_id}", writer)
+        self.next_id += 1
+        self.players[player.id] = player
+        self.send(player, {"type": "welcome", "id": player.id, "name": player.name})
+        if self.pair is not None and not self.round_done.is_set():
+            self.send(player, {"type": "round", "round": self.round, "words": list(self.pair),
+                               "length": self.solutions.length, "time": self.round_time})
+        self.joined.set()
+        self.schedule_standings()
+        return player
+
+    def leave(self, player):
+        self.players.pop(player.id, None)
+        self.check_round_done()
+        self.schedule_standings()
+
+    def submit(self, player, round_number, answer):
+        """Check an answer to the current round and reply to its sender right away."""
+        answer = answer.upper()
+        if round_number != self.round or self.round_done.is_set() or player.solved_round == self.round:
+            self.send(player, {"type": "result", "round": round_number, "correct": False, "late": True})
+            return
+        if answer not in self.solutions:
+            self.send(player, {"type": "result", "round": self.round, "correct": False})
+            return
+        place = self.finishers
+        self.finishers += 1
+        points = len(answer) * 10 + (PLACE_BONUS[place] if place < len(PLACE_BONUS) else 0)
+        player.score += points
+        player.solved_round = self.round
+        self.send(player, {"type": "result", "round": self.round, "correct": True,
+                           "points": points, "place": place + 1, "score": player.score})
+        self.schedule_standings()
+        self.check_round_done()
+
+    def check_round_done(self):
+        if self.players and all(player.solved_round == self.round for player in self.players.values()):
+            self.round_done.set()
+
+    def send(self, player, message):
+        self.write(player, encode(message))
+
+    def write(self, player, data):
+        transport = player.writer.transport
+        if transport.is_closing():
+            return
+        if transport.get_write_buffer_size() > MAX_BUFFER:
+            print(f"Dropping race client {player.name}: not reading")
+            transport.abort()
+            return
+        player.writer.write(data)
+
+    def broadcast(self, message):
+        data = encode(message)
+        for player in list(self.players.values()):
+            self.write(player, data)
+
+    def schedule_standings(self):
+        if not self.standings_pending:
+            self.standings_pending = True
+            asyncio.get_running_loop().call_later(STANDINGS_INTERVAL, self.send_standings)
+
+    def send_standings(self):
+        """Broadcast the top scores, and tell each player whose position changed their new rank."""
+        self.standings_pending = False
+        ranked = sorted(self.players.values(), key=lambda player: (-player.score, player.id))
+        self.broadcast({"type": "standings", "round": self.round, "players": len(ranked),
+                        "top": [[player.name, player.score] for player in ranked[:STANDINGS_SIZE]]})
+        for rank, player in enumerate(ranked, 1):
+            if player.rank != rank:
+                player.rank = rank
+                self.send(player, {"type": "rank", "rank": rank})
+
+
+async def serve(host, port, difficulty, round_time):
+    server = RaceServer(difficulty, round_time)
+    port = await server.start(host, port)
+    print(f"Race server listening on {host}:{port}")
+    try:
+        await server.server.serve_forever()
+    finally:
+        await server.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve LCS race rounds to clients on the local network.")
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--difficulty", type=float, default=RACE_DIFFICULTY)
+    parser.add_argument("--round-time", type=float, default=ROUND_TIME)
+    args = parser.parse_args()
+    try:
+        asyncio.run(serve(args.host, args.port, args.difficulty, args.round_time))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+import pygame
+from settings import DIRTY_RECTS
+
+
+class DirtyRenderer:
+    """Retained-mode renderer that only pushes changed rectangles to the display.
+
+    Screens pre-composite everything static into ``background`` and describe
+    their dynamic widgets with ``draw(name, surface, rect)`` every frame. A
+    widget is redrawn only when its surface object or rectangle changes, which
+    is cheap to detect because ``text_cache`` returns the same surface for the
+    same text. Widgets that are not drawn during a frame are erased.
+    """
+
+    def __init__(self, screen, background, dirty_rects=DIRTY_RECTS):
+        self.screen = screen
+        self.background = background
+        self.dirty_rects = dirty_rects
+        self.widgets = {}
+        self.drawn = set()
+        self.dirty = []
+        self.full_redraw = True
+
+    def set_background(self, background):
+        self.background = background
+        self.invalidate()
+
+    def invalidate(self):
+        """Redraw the whole screen on the next ``present`` (e.g. after drawing outside the renderer)."""
+        self.full_redraw = True
+
+    def draw(self, name, surface, rect):
+        """Place ``surface`` at ``rect`` (a Rect or a top-left position) for this frame."""
+        rect = pygame.Rect(rect) if len(rect) == 4 else surface.get_rect(topleft=rect)
+        self.drawn.add(name)
+        previous = self.widgets.get(name)
+        if previous is not None and previous[0] is surface and previous[1] == rect:
+            return
+        if previous is not None:
+            self.dirty.append(previous[1])
+        self.dirty.append(rect)
+        self.widgets[name] = (surface, rect)
+
+    def update_area(self, name, area):
+        """Redraw part of a widget whose surface was changed in place; ``area`` is relative to the widget."""
+        widget = self.widgets.get(name)
+        if widget is not None:
+            self.dirty.append(pygame.Rect(area).move(widget[1].topleft))
+
+    def present(self):
+        """Erase removed widgets, redraw changed areas and update the display."""
+        for name in list(self.widgets):
+            if name not in self.drawn:
+                self.dirty.append(self.widgets.pop(name)[1])
+        self.drawn = set()
+
+        if self.full_redraw or not self.dirty_rects:
+            self.screen.blit(self.background, (0, 0))
+            for surface, rect in self.widgets.values():
+                self.screen.blit(surface, rect)
+            pygame.display.flip()
+            self.full_redraw = False
+        elif self.dirty:
+            for area in self.dirty:
+                self.screen.blit(self.background, area, area)
+                self.screen.set_clip(area)
+                for surface, rect in self.widgets.values():
+                    if rect.colliderect(area):
+                        self.screen.blit(surface, rect)
+                self.screen.set_clip(None)
+            pygame.display.update(self.dirty)
+        self.dirty = []
@@ -0,0 +1,252 @@
+import argparse
+import os
+import random
+import struct
+import time
+import zlib
+
+from profiler import profiler
+
+# Set LCS_REPLAY_DIR to record every game played from the menu into that directory
+REPLAY_DIR = os.environ.get("LCS_REPLAY_DIR")
+
+# Oldest recordings are deleted so the directory never holds more than this many
+MAX_REPLAYS = 50
+
+# magic, format version, RNG seed, start time, then the player model (skill, success, seconds, puzzles)
+REPLAY_MAGIC = b"LCSR"
+REPLAY_VERSION = 1
+HEADER = struct.Struct("<4sHxxQddddI")
+
+# kind, unicode code point, key / frame milliseconds / pair checksum, time offset in seconds
+RECORD = struct.Struct("<BxHId")
+FRAME, KEY, QUIT, PAIR = range(4)
+
+# Records are collected in memory and written in blocks of about this many bytes (and at every new pair)
+BUFFER_SIZE = 64 * 1024
+
+
+def pair_checksum(pair):
+    return zlib.crc32(" ".join(pair).encode())
+
+
+class SessionRecorder:
+    """Appends everything needed to replay one game to a binary log.
+
+    The file starts with a header holding the RNG seed, the start time and
+    the player's difficulty model, followed by fixed-size records: one per
+    frame (its ``dt`` and clock reading), one per key press and a checksum
+    of every word pair. Records are packed into a buffer and written in
+    blocks, so recording costs a few microseconds per frame. The header and
+    every pair boundary are flushed to disk at once, so a crash loses at
+    most the frames of the current pair.
+    """
+
+    def __init__(self, path, buffer_size=BUFFER_SIZE):
+        self.path = path
+        self.buffer_size = buffer_size
+        self.buffer = bytearray()
+        self.file = None
+
+    def start(self, game):
+        """Write the header and route the game's clock and events through the recorder."""
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        self.file = open(self.path, "wb")
+        self.read_time, self.read_events = game.time_source, game.event_source
+        game.time_source, game.event_source = self.time, self.events
+        self.start_time = self.now = self.read_time()
+        model = game.difficulty.model
+        self.buffer += HEADER.pack(REPLAY_MAGIC, REPLAY_VERSION, game.seed, self.start_time,
+                                   model.skill, model.success, model.seconds, model.puzzles)
+        self.flush()
+
+    def time(self):
+        # Sampled once per frame, so the replay sees exactly the same readings
+        return self.now
+
+    def write(self, kind, value=0, number=0.0, unicode=0):
+        self.buffer += RECORD.pack(kind, unicode, value, number)
+        if len(self.buffer) >= self.buffer_size:
+            self.flush()
+
+    def frame(self, dt):
+        offset = self.read_time() - self.start_time
+        self.now = self.start_time + offset
+        self.write(FRAME, round(dt * 1000), offset)
+
+    def events(self):
+        import pygame
+
+        events = self.read_events()
+        for event in events:
+            if event.type == pygame.KEYDOWN:
+                unicode = ord(event.unicode) if len(event.unicode) == 1 else 0
+                self.write(KEY, event.key, unicode=unicode)
+            elif event.type == pygame.QUIT:
+                self.write(QUIT)
+        return events
+
+    def pair(self, pair):
+        self.write(PAIR, pair_checksum(pair))
+        self.flush()
+
+    def flush(self):
+        if self.file is None or not self.buffer:
+            return
+        with profiler.section("io"):
+            self.file.write(self.buffer)
+            self.file.flush()
+        self.buffer.clear()
+
+    def close(self):
+        if self.file is None:
+            return
+        self.flush()
+        self.file.close()
+        self.file = None
+
+
+class _MemoryStore(dict):
+    """Keeps the replayed player model out of ``players.json``."""
+
+    def set(self, key, value):
+        self[key] = value
+
+
+class SessionReplayer:
+    """Plays a recorded log back into an ``LCSGame``.
+
+    Acts as the game's recorder (so it can take over the seed, clock, events
+    and difficulty model before the first pair is drawn) and as the clock
+    passed to ``run``: every ``tick`` returns the recorded frame time, after
+    sleeping for it divided by ``speed`` (0 replays as fast as possible).
+    """
+
+    def __init__(self, path, speed=1.0):
+        with open(path, "rb") as file:
+            data = file.read()
+        magic, version, self.seed, self.start_time, *model, puzzles = HEADER.unpack_from(data, 0)
+        if magic != REPLAY_MAGIC or version != REPLAY_VERSION:
+            raise ValueError(f"{path} is not a version {REPLAY_VERSION} replay")
+        self.model = dict(zip(("skill", "success", "seconds"), model), puzzles=puzzles)
+        self.speed = speed
+        self.frames = []
+        self.pairs = []
+        # A crash can cut the last record short; everything before it is still usable
+        body = data[HEADER.size:]
+        body = body[:len(body) - len(body) % RECORD.size]
+        for kind, unicode, value, number in RECORD.iter_unpack(body):
+            if kind == FRAME:
+                self.frames.append((value, number, []))
+            elif kind == PAIR:
+                self.pairs.append(value)
+            elif self.frames:
+                self.frames[-1][2].append((kind, value, chr(unicode) if unicode else ""))
+        self.position = 0
+        self.pending = []
+        self.now = self.start_time
+        self.pairs_seen = 0
+        self.mismatches = 0
+
+    @property
+    def done(self):
+        return self.position >= len(self.frames)
+
+    def start(self, game):
+        from difficulty import DifficultyEngine
+
+        game.seed = self.seed
+        game.rng = random.Random(self.seed)
+        game.time_source, game.event_source = self.time, self.events
+        game.difficulty = DifficultyEngine(_MemoryStore(replay=self.model), "replay")
+        # A replay must never change the real high scores or leaderboard
+        game.persist = False
+
+    def time(self):
+        return self.now
+
+    def tick(self, framerate=0):
+        if self.done:
+            # The log ended (e.g. the game crashed): let running effects finish
+            self.pending = [(QUIT, 0, "")]
+            milliseconds = round(1000 / framerate) if framerate else 0
+        else:
+            milliseconds, offset, self.pending = self.frames[self.position]
+            self.now = self.start_time + offset
+            self.position += 1
+        if self.speed:
+            time.sleep(milliseconds / 1000 / self.speed)
+        return milliseconds
+
+    def events(self):
+        import pygame
+        from headless import key_event
+
+        events = [pygame.event.Event(pygame.QUIT) if kind == QUIT else key_event(key, unicode)
+                  for kind, key, unicode in self.pending]
+        self.pending = []
+        return events
+
+    def frame(self, dt):
+        pass
+
+    def pair(self, pair):
+        """Check each new pair against the recording; a mismatch means the replay has diverged."""
+        expected = self.pairs[self.pairs_seen] if self.pairs_seen < len(self.pairs) else None
+        if expected != pair_checksum(pair):
+            if not self.mismatches:
+                print(f"Replay diverged at pair {self.pairs_seen + 1}: {pair[0]} / {pair[1]}")
+            self.mismatches += 1
+        self.pairs_seen += 1
+
+    def close(self):
+        pass
+
+
+def start_recording(directory=REPLAY_DIR):
+    """Return a recorder for a new game in ``directory``, or None when recording is off."""
+    if not directory:
+        return None
+    try:
+        os.makedirs(directory, exist_ok=True)
+        replays = sorted(name for name in os.listdir(directory) if name.endswith(".lcsr"))
+        for name in replays[:max(0, len(replays) - MAX_REPLAYS + 1)]:
+            os.remove(os.path.join(directory, name))
+    except OSError as e:
+        print("Error preparing replay directory:", e)
+        return None
+    name = time.strftime("%Y%m%d-%H%M%S") + f"-{os.getpid()}.lcsr"
+    return SessionRecorder(os.path.join(directory, name))
+
+
+def replay(path, speed=1.0, clock=None):
+    """Play a recording back and return the finished game and the replayer."""
+    from lcs import LCSGame
+
+    replayer = SessionReplayer(path, speed)
+    game = LCSGame(recorder=replayer)
+    game.run(clock or replayer)
+    return game, replayer
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay a recorded LCS game session.")
+    parser.add_argument("path")
+    parser.add_argument("--speed", type=float, default=None,
+                        help="playback speed (default: 1, or as fast as possible with --headless)")
+    parser.add_argument("--headless", action="store_true", help="replay without a window or sound")
+    args = parser.parse_args()
+
+    if args.headless:
+        from headless import enable_headless
+
+        enable_headless()
+    speed = args.speed if args.speed is not None else (0.0 if args.headless else 1.0)
+    start = time.perf_counter()
+    game, replayer = replay(args.path, speed)
+    print(f"Replayed {replayer.position} frames in {time.perf_counter() - start:.2f}s: "
+          f"score {game.score}, level {game.level}, {replayer.mismatches} diverged pairs")
+
+
+if __name__ == "__main__":
+    main()
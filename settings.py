@@ -1,4 +1,3 @@
-import pygame
 import os
 
 # Screen dimensions
@@ -15,12 +14,16 @@ LIGHT_GRAY = (200, 200, 200)
 DARK_GRAY = (40, 40, 40)
 DARK_GREEN = (0, 100, 0)
 GRAY = (128, 128, 128)
-
-# Initialize Pygame
-pygame.init()
+YELLOW = (255, 200, 0)
 
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))  # Get the absolute path of the script's directory
 
 FONT_PATH = os.path.join(BASE_DIR, "assets", "fontvit.otf") 
 
-FONT = pygame.font.Font(FONT_PATH, 28)  # lcs
\ No newline at end of file
+FONT_SIZE = 28  # lcs
+
+# The kiosk build has a single player; set LCS_PLAYER to keep separate models and leaderboard entries
+PLAYER = os.environ.get("LCS_PLAYER", "default")
+
+# Only push changed screen areas to the display (set LCS_DIRTY_RECTS=0 to flip the full screen)
+DIRTY_RECTS = os.environ.get("LCS_DIRTY_RECTS", "1") != "0"
@@ -0,0 +1,87 @@
+import os
+from collections import OrderedDict
+
+import pygame
+from settings import FONT_PATH, FONT_SIZE
+
+# Upper bound for the pixel memory held by cached text surfaces
+MAX_CACHE_BYTES = int(os.environ.get("LCS_TEXT_CACHE_BYTES", 8 * 1024 * 1024))
+
+
+class TextCache:
+    """Fonts keyed by (path, size) and rendered text surfaces kept in an LRU.
+
+    Surfaces are keyed by everything that affects their pixels, so a label
+    that does not change between frames is rendered once. The least recently
+    used surfaces are evicted when their total size exceeds ``max_bytes``.
+    """
+
+    def __init__(self, max_bytes=MAX_CACHE_BYTES):
+        self.max_bytes = max_bytes
+        self.fonts = {}
+        self.surfaces = OrderedDict()
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def font(self, path, size):
+        key = (path, size)
+        font = self.fonts.get(key)
+        if font is None:
+            if not pygame.font.get_init():
+                pygame.font.init()
+            font = self.fonts[key] = pygame.font.Font(path, size)
+        return font
+
+    def render(self, text, color, size=FONT_SIZE, path=FONT_PATH, antialias=True):
+        key = (text, tuple(color), size, path, antialias)
+        surface = self.surfaces.get(key)
+        if surface is not None:
+            self.hits += 1
+            self.surfaces.move_to_end(key)
+            return surface
+
+        self.misses += 1
+        surface = self.font(path, size).render(text, antialias, color)
+        self.surfaces[key] = surface
+        self.bytes += self._surface_bytes(surface)
+        while self.bytes > self.max_bytes and len(self.surfaces) > 1:
+            _, evicted = self.surfaces.popitem(last=False)
+            self.bytes -= self._surface_bytes(evicted)
+            self.evictions += 1
+        return surface
+
+    def _surface_bytes(self, surface):
+        return surface.get_width() * surface.get_height() * surface.get_bytesize()
+
+    def clear(self):
+        self.surfaces.clear()
+        self.bytes = 0
+
+    def stats(self):
+        return {
+            "fonts": len(self.fonts),
+            "surfaces": len(self.surfaces),
+            "bytes": self.bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
+
+
+_text_cache = TextCache()
+
+
+def get_font(path, size):
+    """Return a shared ``pygame.font.Font`` for ``path`` (None for the default font) and ``size``."""
+    return _text_cache.font(path, size)
+
+
+def render_text(text, color, size=FONT_SIZE, path=FONT_PATH, antialias=True):
+    """Render ``text`` once and return the cached surface on later calls."""
+    return _text_cache.render(text, color, size, path, antialias)
+
+
+def text_cache_stats():
+    return _text_cache.stats()
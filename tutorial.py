@@ -1,25 +1,44 @@
 import pygame
-import os
 import math
-from settings import WIDTH, HEIGHT, WHITE, BLACK, GREEN, DARK_GREEN, GRAY, FONT_PATH
+import time
+from settings import WHITE, BLACK, GREEN, DARK_GREEN, GRAY
+from app import get_screen
+from assets import get_background
+from dp_kernel import lcs_table
+from lcs_engine import traceback_path
+from matrix_view import MatrixView
+from text_cache import render_text
+from renderer import DirtyRenderer
+from frame_clock import FramePacer
+from profiler import profiler
 
-screen = pygame.display.set_mode((WIDTH, HEIGHT))
+# Longest word the player can type in for the matrix view
+MAX_CUSTOM_LENGTH = 80
 
-BASE_DIR = os.path.dirname(os.path.abspath(__file__))  # Get the absolute path of the script's directory
+# Longest word or answer that fits on the example card
+CARD_TEXT_LENGTH = 12
 
-BG_IMAGE_PATH = os.path.join(BASE_DIR, "assets", "sun.png") 
+# Frame rate while the player is active or the table is animating, and of the title pulse once idle
+TUTORIAL_FPS = 60
+IDLE_FPS = 10
+
+
+def shorten(text, limit=CARD_TEXT_LENGTH):
+    return text if len(text) <= limit else text[:limit - 3] + "..."
+
+CARD_CONTROLS = ["UP/DOWN: Scroll", "LEFT/RIGHT: Change Words", "TAB: Show Table", "ESC: Exit"]
+MATRIX_CONTROLS = ["SPACE: Skip  R: Replay", "LEFT/RIGHT: Change Words", "ENTER: Your Own Words", "TAB: Back"]
 
 class Tutorial:
     def __init__(self):
-        self.screen_width, self.screen_height = screen.get_size()
+        self.screen_width, self.screen_height = get_screen().get_size()
         self.center_x = self.screen_width // 2
         self.center_y = self.screen_height // 2
         self.scroll_offset = 0
         
         # Improved fonts with better sizing
-        self.title_font = pygame.font.Font(None, int(self.screen_height * 0.08))
-        self.font = pygame.font.Font(FONT_PATH, int(self.screen_height * 0.05))
-        self.small_font = pygame.font.Font(None, int(self.screen_height * 0.03))
+        self.font_size = int(self.screen_height * 0.05)
+        self.small_font_size = int(self.screen_height * 0.03)
         
         # Simple examples that kids can relate to
         self.sequences = [
@@ -27,123 +46,114 @@ class Tutorial:
             {'seq1': 'KITTEN', 'seq2': 'SITTING'},
             {'seq1': 'DRAGON', 'seq2': 'GARDEN'}
         ]
-        self.current_example = 0
-        self.matrix = self.calculate_lcs_matrix(
-            self.sequences[self.current_example]['seq1'],
-            self.sequences[self.current_example]['seq2']
-        )
-        self.lcs_result = self.get_lcs(
-            self.sequences[self.current_example]['seq1'],
-            self.sequences[self.current_example]['seq2'],
-            self.matrix
-        )
+        # (matrix, traceback path) per pair, so examples seen before are never recomputed
+        self.solved = {}
+        # Pairs whose table animation already played once
+        self.animated = set()
+        self.mode = "cards"
+        self.matrix_view = None
+        self.typed_words = None
+        self.select_example(0)
         
         # Animation variables
         self.animation_counter = 0
         self.animation_speed = 2
+        self.last_frame = time.perf_counter()
 
         # load BG
-        self.bg_image = pygame.image.load(BG_IMAGE_PATH)
-        self.bg_image = pygame.transform.scale(self.bg_image, (WIDTH, HEIGHT))
-        
+        self.bg_image = get_background()
+        self.card_background = self.build_background()
+        self.matrix_background = None
+        self.renderer = DirtyRenderer(get_screen(), self.card_background)
+        self.explanation_offset = None
+        self.explanation_surface = None
+
         
     def draw_rounded_rect(self, surface, rect, color, radius=20):
         """Draw a rounded rectangle"""
         pygame.draw.rect(surface, color, rect, border_radius=radius)
         
     def calculate_lcs_matrix(self, seq1, seq2):
-        m, n = len(seq1), len(seq2)
-        dp = [[0] * (n + 1) for _ in range(m + 1)]
-        
-        for i in range(1, m + 1):
-            for j in range(1, n + 1):
-                if seq1[i-1] == seq2[j-1]:
-                    dp[i][j] = dp[i-1][j-1] + 1
-                else:
-                    dp[i][j] = max(dp[i-1][j], dp[i][j-1])
-        
-        return dp
-    
-    def get_lcs(self, seq1, seq2, matrix):
-        m, n = len(seq1), len(seq2)
-        i, j = m, n
-        lcs = []
-        
-        while i > 0 and j > 0:
-            if seq1[i-1] == seq2[j-1]:
-                lcs.append(seq1[i-1])
-                i -= 1
-                j -= 1
-            elif matrix[i-1][j] > matrix[i][j-1]:
-                i -= 1
-            else:
-                j -= 1
-        
-        return ''.join(reversed(lcs))
+        return lcs_table(seq1, seq2)
     
-    def draw_explanation(self):
-        # Animated title with pulsing effect
-        pulse = abs(math.sin(self.animation_counter / 30)) * 10
-        title_size = int(self.screen_height * 0.08 + pulse)
-        title_font = pygame.font.Font(FONT_PATH, title_size)
-        title_text = title_font.render("Tutorial LCS Game!", True, BLACK)
-        title_rect = title_text.get_rect(center=(self.center_x, self.screen_height // 10))
-        screen.blit(title_text, title_rect)
-        
+    def build_background(self):
+        """Pre-composite the cards, labels and controls that never change."""
+        background = self.bg_image.copy()
+
         # Example card background
-        card_rect = pygame.Rect(
+        self.card_rect = pygame.Rect(
             self.center_x - 300,
             self.screen_height // 4 - 50,
             600,
             300
         )
-        self.draw_rounded_rect(screen, card_rect, GRAY)
-        
-        # Current example with friendly explanation
-        seq1 = self.sequences[self.current_example]['seq1']
-        seq2 = self.sequences[self.current_example]['seq2']
+        self.draw_rounded_rect(background, self.card_rect, GRAY)
         
         # Game number with background
-        number_rect = pygame.Rect(
-            card_rect.left + 20,
-            card_rect.top + 20,
+        self.number_rect = pygame.Rect(
+            self.card_rect.left + 20,
+            self.card_rect.top + 20,
             200,
             40
         )
-        self.draw_rounded_rect(screen, number_rect, DARK_GREEN)
-        example_text = self.font.render(f"Game #{self.current_example + 1}", True, WHITE)
-        example_rect = example_text.get_rect(center=number_rect.center)
-        screen.blit(example_text, example_rect)
+        self.draw_rounded_rect(background, self.number_rect, DARK_GREEN)
         
-        # Words with highlighting
-        y_offset = card_rect.top + 100
-        for idx, (label, word) in enumerate([("Word 1:", seq1), ("Word 2:", seq2)]):
-            label_text = self.font.render(label, True, WHITE)
-            word_text = self.font.render(word, True, GREEN)
-            screen.blit(label_text, (card_rect.left + 50, y_offset + idx * 60))
-            screen.blit(word_text, (card_rect.left + 250, y_offset + idx * 60))
+        # Word labels
+        y_offset = self.card_rect.top + 100
+        for idx, label in enumerate(["Word 1:", "Word 2:"]):
+            label_text = render_text(label, WHITE, self.font_size)
+            background.blit(label_text, (self.card_rect.left + 50, y_offset + idx * 60))
         
         # Result in highlighted box
-        result_rect = pygame.Rect(
-            card_rect.left + 50,
+        self.result_box = pygame.Rect(
+            self.card_rect.left + 50,
             y_offset + 120,
             500,
             60
         )
-        self.draw_rounded_rect(screen, result_rect, DARK_GREEN)
-        result_text = self.font.render(f"Matching letters: {self.lcs_result}", True, WHITE)
-        result_rect = result_text.get_rect(center=(result_rect.centerx, result_rect.centery))
-        screen.blit(result_text, result_rect)
+        self.draw_rounded_rect(background, self.result_box, DARK_GREEN)
         
-        # Draw kid-friendly explanation in a scrollable card
-        explanation_card = pygame.Rect(
+        # Kid-friendly explanation in a scrollable card
+        self.explanation_card = pygame.Rect(
             self.center_x - 300,
             self.screen_height // 2 + 100,
             600,
             200
         )
-        self.draw_rounded_rect(screen, explanation_card, GRAY)
+        self.draw_rounded_rect(background, self.explanation_card, GRAY)
         
+        # Create a clipping rectangle for scrolling
+        pygame.draw.rect(background, BLACK, (
+            self.explanation_card.left,
+            self.explanation_card.top - 2,
+            self.explanation_card.width,
+            2
+        ))
+        pygame.draw.rect(background, BLACK, (
+            self.explanation_card.left,
+            self.explanation_card.bottom,
+            self.explanation_card.width,
+            2
+        ))
+
+        self.draw_controls(background)
+        return background
+
+    def build_matrix_background(self):
+        """Pre-composite the panel behind the DP table."""
+        background = self.bg_image.copy()
+        panel = pygame.Rect(30, self.screen_height // 6, self.screen_width - 60, self.screen_height - 60 - self.screen_height // 6 - 20)
+        self.draw_rounded_rect(background, panel, GRAY)
+        self.matrix_rect = pygame.Rect(panel.left + 10, panel.top + 10, panel.width - 20, panel.height - 70)
+        self.status_pos = (panel.left + 30, self.matrix_rect.bottom + 15)
+        self.draw_controls(background, MATRIX_CONTROLS)
+        return background
+
+    def render_explanation(self):
+        """Render the visible explanation lines for the current scroll offset."""
+        if self.explanation_offset == self.scroll_offset:
+            return self.explanation_surface
+
         explanations = [
             "This game finds the letters that appear in the same order",
             "in both words, even if they're not next to each other!",
@@ -157,93 +167,216 @@ class Tutorial:
             "1. We look at each letter in both words",
             "2. When letters match, we add them to our result",
             "3. If they don't match, we skip to the next letter",
-            "4. The longest match wins!"
+            "4. The longest match wins!",
+            "",
+            "More Puzzles in the menu use the same table idea:",
+            "• Common substring: matching letters side by side",
+            "• Edit distance: changes to turn one word into the other",
+            "• Supersequence: the shortest word holding both"
         ]
         
-        # Create a clipping rectangle for scrolling
-        pygame.draw.rect(screen, BLACK, (
-            explanation_card.left,
-            explanation_card.top - 2,
-            explanation_card.width,
-            2
-        ))
-        pygame.draw.rect(screen, BLACK, (
-            explanation_card.left,
-            explanation_card.bottom,
-            explanation_card.width,
-            2
-        ))
-        
-        y_offset = explanation_card.top + 20 - self.scroll_offset
+        card = self.explanation_card
+        surface = pygame.Surface(card.size, pygame.SRCALPHA)
+        y_offset = 20 - self.scroll_offset
         for i, line in enumerate(explanations):
-            text = self.small_font.render(line, True, WHITE)
-            rect = text.get_rect(left=explanation_card.left + 30, top=y_offset + i * 25)
-            if explanation_card.top <= rect.top <= explanation_card.bottom - 30:
-                screen.blit(text, rect)
+            text = render_text(line, WHITE, self.small_font_size, None)
+            rect = text.get_rect(left=30, top=y_offset + i * 25)
+            if 0 <= rect.top <= card.height - 30:
+                surface.blit(text, rect)
+
+        self.explanation_offset = self.scroll_offset
+        self.explanation_surface = surface
+        return surface
+
+    def draw_title(self):
+        # Animated title with pulsing effect
+        pulse = abs(math.sin(self.animation_counter / 30)) * 10
+        title_size = int(self.screen_height * 0.08 + pulse)
+        title_text = render_text("Tutorial LCS Game!", BLACK, title_size)
+        title_rect = title_text.get_rect(center=(self.center_x, self.screen_height // 10))
+        self.renderer.draw("title", title_text, title_rect)
+
+    def draw_explanation(self):
+        """Describe the dynamic widgets; the renderer redraws only those that changed."""
+        self.draw_title()
+        
+        # Current example with friendly explanation
+        seq1 = self.sequences[self.current_example]['seq1']
+        seq2 = self.sequences[self.current_example]['seq2']
+        
+        example_text = render_text(f"Game #{self.current_example + 1}", WHITE, self.font_size)
+        example_rect = example_text.get_rect(center=self.number_rect.center)
+        self.renderer.draw("example", example_text, example_rect)
+        
+        # Words with highlighting
+        y_offset = self.card_rect.top + 100
+        for idx, word in enumerate([seq1, seq2]):
+            word_text = render_text(shorten(word), GREEN, self.font_size)
+            self.renderer.draw(f"word{idx}", word_text, (self.card_rect.left + 250, y_offset + idx * 60))
+        
+        result_text = render_text(f"Matching letters: {shorten(self.lcs_result)}", WHITE, self.font_size)
+        result_rect = result_text.get_rect(center=self.result_box.center)
+        self.renderer.draw("result", result_text, result_rect)
+        
+        self.renderer.draw("explanation", self.render_explanation(), self.explanation_card.topleft)
+
+    def draw_matrix(self):
+        """Advance the table animation and push only the cells it repainted."""
+        self.draw_title()
+        dirty = self.matrix_view.update()
+        self.renderer.draw("matrix", self.matrix_view.surface, self.matrix_rect.topleft)
+        for area in dirty:
+            self.renderer.update_area("matrix", area)
+
+        if self.typed_words is not None:
+            prompt = f"Word {len(self.typed_words)}: {self.typed_words[-1]}_  (ENTER: next, ESC: cancel)"
+            status_text = render_text(prompt, WHITE, self.small_font_size, None)
+        else:
+            status_text = render_text(self.matrix_view.status(), WHITE, self.small_font_size, None)
+        self.renderer.draw("status", status_text, self.status_pos)
     
-    def draw_controls(self):
+    def draw_controls(self, surface, controls=CARD_CONTROLS):
         # Draw controls in a bottom bar
         control_rect = pygame.Rect(0, self.screen_height - 60, self.screen_width, 60)
-        self.draw_rounded_rect(screen, control_rect, DARK_GREEN)
-        
-        controls = [
-            "UP/DOWN arrows: Scroll",
-            "LEFT/RIGHT arrows: Change Words",
-            "ESC: Exit"
-        ]
+        self.draw_rounded_rect(surface, control_rect, DARK_GREEN)
         
         for i, control in enumerate(controls):
-            text = self.small_font.render(control, True, WHITE)
-            x_pos = self.screen_width // 4 * (i + 1) - text.get_width() // 2
-            screen.blit(text, (x_pos, self.screen_height - 37))
+            text = render_text(control, WHITE, self.small_font_size, None)
+            x_pos = self.screen_width // (len(controls) + 1) * (i + 1) - text.get_width() // 2
+            surface.blit(text, (x_pos, self.screen_height - 37))
+
+    def solve(self, seq1, seq2):
+        """Return the memoized ``(matrix, traceback path)`` of a pair, computing it on first use."""
+        key = (seq1, seq2)
+        if key not in self.solved:
+            with profiler.section("lcs"):
+                matrix = self.calculate_lcs_matrix(seq1, seq2)
+                self.solved[key] = (matrix, traceback_path(seq1, seq2, matrix))
+        return self.solved[key]
     
-    def show(self):
-        clock = pygame.time.Clock()
+    def select_example(self, index):
+        self.current_example = index % len(self.sequences)
+        seq1 = self.sequences[self.current_example]['seq1']
+        seq2 = self.sequences[self.current_example]['seq2']
+        if self.mode == "matrix":
+            self.show_matrix(seq1, seq2)
+            return
+        self.matrix, path = self.solve(seq1, seq2)
+        self.lcs_result = "".join(seq1[i - 1] for i, _, matched in reversed(path) if matched)
+
+    def show_matrix(self, seq1, seq2, replay=False):
+        """Show the table of a pair, animating it unless it already played before."""
+        key = (seq1, seq2)
+        animate = replay or key not in self.animated
+        self.animated.add(key)
+        self.matrix_view = MatrixView(seq1, seq2, self.matrix_rect.size, self.solved.get(key), animate)
+
+    def toggle_matrix(self):
+        if self.mode == "cards":
+            if self.matrix_background is None:
+                self.matrix_background = self.build_matrix_background()
+            self.mode = "matrix"
+            self.renderer.set_background(self.matrix_background)
+        else:
+            self.mode = "cards"
+            self.typed_words = None
+            self.renderer.set_background(self.card_background)
+        self.select_example(self.current_example)
+
+    def handle_matrix_key(self, event):
+        if event.key == pygame.K_SPACE:
+            self.matrix_view.finish()
+        elif event.key == pygame.K_r:
+            self.show_matrix(self.matrix_view.seq1, self.matrix_view.seq2, replay=True)
+        elif event.key == pygame.K_RETURN:
+            self.typed_words = [""]
+
+    def handle_typing(self, event):
+        """Collect two words typed by the player, then add them as a new example."""
+        word = self.typed_words[-1]
+        if event.key == pygame.K_ESCAPE:
+            self.typed_words = None
+        elif event.key == pygame.K_BACKSPACE:
+            self.typed_words[-1] = word[:-1]
+        elif event.key == pygame.K_RETURN:
+            if not word:
+                return
+            if len(self.typed_words) == 1:
+                self.typed_words.append("")
+                return
+            seq1, seq2 = self.typed_words
+            self.typed_words = None
+            self.sequences.append({'seq1': seq1, 'seq2': seq2})
+            self.select_example(len(self.sequences) - 1)
+        elif event.unicode.isalpha() and len(word) < MAX_CUSTOM_LENGTH:
+            self.typed_words[-1] = word + event.unicode.upper()
+
+    def finish_matrix_animation(self):
+        # Keep what the animation computed so the pair is never solved again
+        view = self.matrix_view
+        if view.solved is not None:
+            self.solved.setdefault((view.seq1, view.seq2), view.solved)
+
+    def busy(self):
+        """True while the table animation runs, which needs every frame."""
+        return self.mode == "matrix" and self.matrix_view.phase != "done"
+
+    def step(self, events=None):
+        """Handle input and draw one frame; returns False once the tutorial is closed."""
         running = True
+        # Advance by elapsed time, so the title pulses at the same speed when idle frames are spread out
+        now = time.perf_counter()
+        self.animation_counter += self.animation_speed * min(now - self.last_frame, 1.0) * TUTORIAL_FPS
+        self.last_frame = now
         
-        while running:
-            self.animation_counter += self.animation_speed
-            
-            for event in pygame.event.get():
+        with profiler.section("events"):
+            for event in pygame.event.get() if events is None else events:
+                if profiler.handle_event(event):
+                    continue
                 if event.type == pygame.QUIT:
                     running = False
                 elif event.type == pygame.KEYDOWN:
-                    if event.key == pygame.K_ESCAPE:
+                    if self.typed_words is not None:
+                        self.handle_typing(event)
+                    elif event.key == pygame.K_ESCAPE:
                         running = False
+                    elif event.key == pygame.K_TAB:
+                        self.toggle_matrix()
                     elif event.key == pygame.K_DOWN:
                         self.scroll_offset += 20
                     elif event.key == pygame.K_UP:
                         self.scroll_offset -= 20
                     elif event.key == pygame.K_RIGHT:
-                        self.current_example = (self.current_example + 1) % len(self.sequences)
-                        self.matrix = self.calculate_lcs_matrix(
-                            self.sequences[self.current_example]['seq1'],
-                            self.sequences[self.current_example]['seq2']
-                        )
-                        self.lcs_result = self.get_lcs(
-                            self.sequences[self.current_example]['seq1'],
-                            self.sequences[self.current_example]['seq2'],
-                            self.matrix
-                        )
+                        self.select_example(self.current_example + 1)
                     elif event.key == pygame.K_LEFT:
-                        self.current_example = (self.current_example - 1) % len(self.sequences)
-                        self.matrix = self.calculate_lcs_matrix(
-                            self.sequences[self.current_example]['seq1'],
-                            self.sequences[self.current_example]['seq2']
-                        )
-                        self.lcs_result = self.get_lcs(
-                            self.sequences[self.current_example]['seq1'],
-                            self.sequences[self.current_example]['seq2'],
-                            self.matrix
-                        )
-            
-            # Adjust scroll bounds
-            max_scroll = 13 * 25 - 150  # Approximate max scroll
-            self.scroll_offset = max(0, min(self.scroll_offset, max_scroll))
-            
-            # screen.fill(BLACK)
-            screen.blit(self.bg_image, (0, 0))
-            self.draw_explanation()
-            self.draw_controls()
-            pygame.display.flip()
-            clock.tick(60)
\ No newline at end of file
+                        self.select_example(self.current_example - 1)
+                    elif self.mode == "matrix":
+                        self.handle_matrix_key(event)
+        
+        # Adjust scroll bounds
+        max_scroll = 18 * 25 - 150  # Approximate max scroll
+        self.scroll_offset = max(0, min(self.scroll_offset, max_scroll))
+        
+        with profiler.section("render"):
+            if self.mode == "matrix":
+                self.draw_matrix()
+                self.finish_matrix_animation()
+            else:
+                self.draw_explanation()
+            profiler.draw_overlay(self.renderer)
+            self.renderer.present()
+        profiler.frame()
+        return running
+
+    def show(self):
+        pacer = FramePacer(TUTORIAL_FPS, IDLE_FPS)
+        events = None
+        while self.step(events):
+            events = pacer.wait(self.busy())
+
+    async def show_async(self):
+        """Same as ``show`` but yields to the asyncio event loop every frame."""
+        pacer = FramePacer(TUTORIAL_FPS, IDLE_FPS)
+        events = None
+        while self.step(events):
+            events = await pacer.wait_async(self.busy())
@@ -0,0 +1,67 @@
+import random
+from bisect import bisect_right
+from collections import defaultdict
+
+
+class WordIndex:
+    """Upper-cased words bucketed by length.
+
+    Every bucket holds all words of one length packed into a single string,
+    so word ``k`` of length ``L`` is ``bucket[k * L:(k + 1) * L]``. Picking a
+    word for any length range only needs the cumulative counts below.
+    """
+
+    def __init__(self, buckets):
+        """Build the index from packed buckets, where ``buckets[length]`` is a string."""
+        self.buckets = list(buckets) or [""]
+        self.max_length = len(self.buckets) - 1
+        self.counts = [len(bucket) // length if length else 0 for length, bucket in enumerate(self.buckets)]
+
+        # starts[length] is the number of words shorter than ``length``
+        self.starts = [0] * (self.max_length + 2)
+        for length, count in enumerate(self.counts):
+            self.starts[length + 1] = self.starts[length] + count
+
+    @classmethod
+    def from_words(cls, words):
+        """Upper-case, bucket and pack a plain list of words."""
+        buckets = defaultdict(list)
+        for word in words:
+            word = word.upper()
+            if word:
+                buckets[len(word)].append(word)
+        max_length = max(buckets, default=0)
+        return cls("".join(buckets.get(length, ())) for length in range(max_length + 1))
+
+    def __len__(self):
+        return self.starts[-1]
+
+    def _clamp(self, min_length, max_length):
+        return max(min_length, 1), min(max_length, self.max_length)
+
+    def count(self, min_length, max_length):
+        """Number of words whose length is within ``[min_length, max_length]``."""
+        low, high = self._clamp(min_length, max_length)
+        if low > high:
+            return 0
+        return self.starts[high + 1] - self.starts[low]
+
+    def word_at(self, position):
+        """Return the word at a global position (words are ordered by length)."""
+        length = bisect_right(self.starts, position) - 1
+        offset = (position - self.starts[length]) * length
+        return self.buckets[length][offset:offset + length]
+
+    def random_word(self, min_length, max_length, rng=random):
+        low, high = self._clamp(min_length, max_length)
+        count = self.count(low, high)
+        if count == 0:
+            raise ValueError("No words available in the specified length range.")
+        return self.word_at(self.starts[low] + rng.randrange(count))
+
+    def random_pair(self, min_length, max_length, rng=random):
+        """Pick two words independently, like ``random.choice`` on a filtered list."""
+        if self.count(min_length, max_length) < 2:
+            raise ValueError("Not enough words available in the specified length range.")
+        return self.random_word(min_length, max_length, rng), self.random_word(min_length, max_length, rng)
+